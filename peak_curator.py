@@ -19,12 +19,17 @@ python peak_curator.py   # click ➕ Load to open .abf or .csv
 
 from __future__ import annotations
 
+import csv
+import io
+import operator
 import sys
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Tuple, Optional
 
 import numpy as np
-import pandas as pd
 import scipy.signal as signal
 
 # ── Qt & plotting ────────────────────────────────────────────────────────────
@@ -44,16 +49,16 @@ from PyQt5.QtWidgets import (
     QMessageBox,
     QMenuBar,
     QDialog,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QHeaderView,
     QAbstractItemView,
     QShortcut,
     QMenu,
+    QPlainTextEdit,
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QClipboard, QKeySequence
-from PyQt5.QtCore import QTimer, pyqtSignal
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PyQt5.QtGui import QClipboard, QKeySequence, QFont
+from PyQt5.QtCore import QTimer, QSettings, pyqtSignal
 import pyqtgraph as pg
 
 # ── Optional ABF support ─────────────────────────────────────────────────────
@@ -62,7 +67,406 @@ try:
 except ImportError:  # pragma: no cover
     pyabf = None  # .abf support disabled if library missing
 
+# ── Optional Numba acceleration ──────────────────────────────────────────────
+try:
+    import numba  # type: ignore
+    from numba import prange  # type: ignore
+except ImportError:  # pragma: no cover
+    numba = None  # per-peak measurements fall back to the NumPy loops
+    prange = range
+
+# ── Optional OpenGL rendering ────────────────────────────────────────────────
+try:
+    import OpenGL  # type: ignore  # noqa: F401
+except ImportError:  # pragma: no cover
+    OpenGL = None  # software (QPainter) rendering if PyOpenGL missing
+
 pg.setConfigOptions(antialias=True)
+if OpenGL is not None:
+    pg.setConfigOptions(useOpenGL=True, enableExperimental=True)
+
+# Number of decoded ABF sweeps kept in memory (least recently used dropped)
+_SWEEP_CACHE_SIZE = 32
+
+# Number of filter designs (SOS coefficient sets) kept per window
+_FILTER_CACHE_SIZE = 16
+
+# Write buffer for CSV exports (bytes)
+_EXPORT_BUFFER_SIZE = 1 << 20
+
+# Exports with fewer rows than this are built in memory and written at once
+_SMALL_EXPORT_ROWS = 10_000
+
+# Upper bound on elements gathered at once by the vectorized per-peak helpers
+_BLOCK_ELEMENTS = 1 << 22
+
+# Sentinel for ABF attributes that are not present on the loaded file
+_MISSING = object()
+
+# ABF properties listed in the file information dialog
+_ABF_INFO_LABELS = ('Protocol', 'Channels', 'Sweeps', 'Data Points per Sweep',
+                    'Recording Duration (s)', 'Sweep Length (s)', 'Data Rate (Hz)')
+_ABF_INFO_ATTRS = ('protocol', 'channelCount', 'sweepCount', 'dataPointsPerSweep',
+                   'recordingLengthSec', 'sweepLengthSec', 'dataRate')
+_ABF_ATTR_GETTER = operator.attrgetter(*_ABF_INFO_ATTRS)
+_ABF_TIMING_ATTRS = ('sweepTimesSec', 'sweepTimesMin', 'sweepStartSec')
+
+# Timing method reported when peak data carries no Timing_Method column
+_DEFAULT_TIMING = ('unknown',)
+
+
+# ── Per-peak kernels (compiled with Numba when available) ────────────────────
+
+def _local_baseline(v, peak_idx, baseline_window, baseline_distance):
+    """Median of the signal either side of a peak, skipping the peak itself."""
+    n = len(v)
+    left_start = max(0, peak_idx - baseline_window - baseline_distance)
+    left_end = max(0, peak_idx - baseline_distance)
+    right_start = min(n, peak_idx + baseline_distance)
+    right_end = min(n, peak_idx + baseline_window + baseline_distance)
+    n_left = max(0, left_end - left_start)
+    n_right = max(0, right_end - right_start)
+    
+    if n_left + n_right == 0:
+        # Fallback: local mean if no baseline region is available
+        return np.mean(v[max(0, peak_idx - 5):min(n, peak_idx + 6)])
+    
+    values = np.empty(n_left + n_right, dtype=v.dtype)
+    values[:n_left] = v[left_start:left_end]
+    values[n_left:] = v[right_start:right_end]
+    return np.median(values)
+
+
+def _median_baselines(v, peaks, baseline_window, baseline_distance):
+    """Vectorized _local_baseline for an array of peaks (NumPy path).
+    
+    Peaks whose flanking windows lie fully inside the trace are gathered
+    from a sliding-window view and reduced with one median per block; the
+    few peaks near the trace edges use the scalar helper.
+    """
+    n = len(v)
+    baselines = np.empty(len(peaks), dtype=v.dtype)
+    reach = baseline_window + baseline_distance
+    interior = (peaks >= reach) & (peaks + reach <= n)
+    
+    rows = np.flatnonzero(interior)
+    if len(rows) > 0:
+        windows = np.lib.stride_tricks.sliding_window_view(v, baseline_window)
+        block = max(1, _BLOCK_ELEMENTS // (2 * baseline_window))
+        for start in range(0, len(rows), block):
+            sel = rows[start:start + block]
+            p = peaks[sel]
+            samples = np.concatenate((windows[p - reach], windows[p + baseline_distance]), axis=1)
+            # The gathered block is a private temporary, so let median
+            # partition it in place instead of copying it first
+            baselines[sel] = np.median(samples, axis=1, overwrite_input=True)
+    
+    for i in np.flatnonzero(~interior):
+        baselines[i] = _local_baseline(v, int(peaks[i]), baseline_window, baseline_distance)
+    return baselines
+
+
+def _first_crossing(v, peaks, half_max, search_window, step):
+    """Offset of the first sample at or below *half_max* walking from each peak.
+    
+    Walks in direction *step* (-1 left, +1 right) for at most *search_window*
+    samples; 0 where no crossing is found. Offsets are tested in chunks that
+    double in size, so narrow peaks drop out early (NumPy path).
+    """
+    offsets = np.zeros(len(peaks), dtype=np.int64)
+    pending = np.flatnonzero(search_window > 0)
+    start, chunk = 0, 64
+    
+    while len(pending) > 0:
+        steps = np.arange(start, start + chunk)
+        idx = np.clip(peaks[pending, None] + step * steps, 0, len(v) - 1)
+        hit = (v[idx] <= half_max[pending, None]) & (steps < search_window[pending, None])
+        found = hit.any(axis=1)
+        offsets[pending[found]] = start + hit[found].argmax(axis=1)
+        
+        start += chunk
+        pending = pending[~found & (search_window[pending] > start)]
+        chunk *= 2
+    return offsets
+
+
+def _baseline_kernel(v, peaks, baseline_window, baseline_distance, baselines_out):
+    """Local baseline under each peak, written into *baselines_out*."""
+    for i in prange(len(peaks)):
+        baselines_out[i] = _local_baseline(v, peaks[i], baseline_window, baseline_distance)
+
+
+def _fwhm_kernel(v, peaks, baselines, fs, max_search, widths_out):
+    """Full width at half maximum of each peak in seconds, written into *widths_out*.
+    
+    Scans outward from every peak and stops at the first sample at or below
+    half maximum, so the cost follows the actual width rather than max_search.
+    """
+    n = len(v)
+    for i in prange(len(peaks)):
+        p = peaks[i]
+        baseline = baselines[i]
+        # Threshold in the trace dtype (float32), so the scans compare like
+        # with like instead of promoting every sample to float64
+        half_max = v.dtype.type(baseline + (v[p] - baseline) * v.dtype.type(0.5))
+        search_window = min(p, n - p - 1, max_search)
+        
+        left_idx = p
+        j = p
+        while j > p - search_window:
+            if v[j] <= half_max:
+                left_idx = j
+                break
+            j -= 1
+        
+        right_idx = p
+        j = p
+        while j < p + search_window:
+            if v[j] <= half_max:
+                right_idx = j
+                break
+            j += 1
+        
+        widths_out[i] = (right_idx - left_idx) / fs
+
+
+def _local_maxima(x, sign):
+    """Local maxima of *sign* * *x* (plateau midpoints), as in scipy.signal.find_peaks."""
+    out = np.empty(len(x) // 2 + 1, dtype=np.int64)
+    m = 0
+    i = 1
+    i_max = len(x) - 1
+    while i < i_max:
+        if sign * x[i - 1] < sign * x[i]:
+            i_ahead = i + 1
+            while i_ahead < i_max and x[i_ahead] == x[i]:
+                i_ahead += 1
+            if sign * x[i_ahead] < sign * x[i]:
+                out[m] = (i + i_ahead - 1) // 2
+                m += 1
+                i = i_ahead
+        i += 1
+    return out[:m]
+
+
+def _select_by_distance(peaks, order, distance):
+    """Keep mask enforcing a minimum distance, highest peaks first (*order* ascending)."""
+    n = len(peaks)
+    keep = np.ones(n, dtype=np.bool_)
+    for i in range(n - 1, -1, -1):
+        j = order[i]
+        if not keep[j]:
+            continue
+        k = j - 1
+        while k >= 0 and peaks[j] - peaks[k] < distance:
+            keep[k] = False
+            k -= 1
+        k = j + 1
+        while k < n and peaks[k] - peaks[j] < distance:
+            keep[k] = False
+            k += 1
+    return keep
+
+
+def _peak_prominences(x, peaks, sign):
+    """Topographic prominence of each peak of *sign* * *x* (unbounded window, peaks in parallel)."""
+    n = len(x)
+    out = np.empty(len(peaks), dtype=np.float64)
+    for k in prange(len(peaks)):
+        p = peaks[k]
+        height = sign * np.float64(x[p])
+        left_min = height
+        i = p
+        while i >= 0 and sign * np.float64(x[i]) <= height:
+            left_min = min(left_min, sign * np.float64(x[i]))
+            i -= 1
+        right_min = height
+        i = p
+        while i < n and sign * np.float64(x[i]) <= height:
+            right_min = min(right_min, sign * np.float64(x[i]))
+            i += 1
+        out[k] = height - max(left_min, right_min)
+    return out
+
+
+def _stats_kernel(x):
+    """Min, max and first-sample-shifted sum / sum of squares in one pass."""
+    x0 = np.float64(x[0])
+    lo = x0
+    hi = x0
+    s1 = 0.0
+    s2 = 0.0
+    for i in range(len(x)):
+        v = np.float64(x[i])
+        lo = min(lo, v)
+        hi = max(hi, v)
+        d = v - x0
+        s1 += d
+        s2 += d * d
+    return lo, hi, s1, s2
+
+
+if numba is not None:
+    _jit = numba.njit(cache=True, nogil=True, fastmath=True)
+    _local_baseline = _jit(_local_baseline)
+    _local_maxima = _jit(_local_maxima)
+    _select_by_distance = _jit(_select_by_distance)
+    _stats_kernel = _jit(_stats_kernel)
+    _jit_parallel = numba.njit(cache=True, nogil=True, fastmath=True, parallel=True)
+    _baseline_kernel = _jit_parallel(_baseline_kernel)
+    _fwhm_kernel = _jit_parallel(_fwhm_kernel)
+    _peak_prominences = _jit_parallel(_peak_prominences)
+
+
+def _trace_stats(x: np.ndarray) -> dict:
+    """Min/Max/Mean/Std/Range/RMS of a trace from one set of running sums.
+    
+    Sums are taken relative to the first sample so the variance does not
+    cancel catastrophically on traces with a large DC offset.
+    """
+    n = len(x)
+    if numba is not None:
+        lo, hi, s1, s2 = _stats_kernel(np.ascontiguousarray(x))
+    else:
+        lo, hi = float(np.min(x)), float(np.max(x))
+        d = x.astype(np.float64)
+        d -= d[0]
+        s1, s2 = float(d.sum()), float(d @ d)
+    
+    shift_mean = s1 / n
+    mean = float(x[0]) + shift_mean
+    var = max(s2 / n - shift_mean * shift_mean, 0.0)
+    return {
+        'Min': lo,
+        'Max': hi,
+        'Mean': mean,
+        'Std': np.sqrt(var),
+        'Range': hi - lo,
+        'RMS': np.sqrt(var + mean * mean),
+    }
+
+
+def _find_peaks_fast(x: np.ndarray, prominence: float, distance: int,
+                     sign: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Equivalent of ``signal.find_peaks(sign * x, prominence=..., distance=...)``.
+    
+    Same selection order as SciPy (distance, then prominence); the priority
+    sort stays in NumPy so ties between equal heights resolve identically.
+    Troughs (*sign* = -1) are found without building a negated copy of *x*.
+    Returns (peaks, prominences).
+    """
+    sign = float(sign)
+    peaks = _local_maxima(x, sign)
+    if distance > 1 and len(peaks) > 1:
+        order = np.argsort(sign * x[peaks].astype(np.float64))
+        peaks = peaks[_select_by_distance(peaks, order, distance)]
+    prominences = _peak_prominences(x, peaks, sign)
+    keep = prominences >= prominence
+    return peaks[keep], prominences[keep]
+
+
+def _write_csv_with_header(fname: str, header: List[str], columns: dict):
+    """Write '#' comment header lines followed by a dict of columns as CSV.
+    
+    Rows are written straight from the column arrays with csv.writer, so no
+    DataFrame is built just to export. NumPy scalars format with their
+    shortest repr, matching DataFrame.to_csv output.
+    
+    Small exports (the usual interactive case) are formatted into a string
+    and written in one call; large ones stream through a buffered file.
+    """
+    names = list(columns)
+    n_rows = len(columns[names[0]]) if names else 0
+    # Integer and float64 columns become Python numbers, which print the same
+    # as NumPy scalars but faster; float32 keeps its shorter float32 repr.
+    cells = [values.tolist() if isinstance(values, np.ndarray)
+             and (values.dtype.kind in 'iub' or values.dtype == np.float64) else values
+             for values in (columns[name] for name in names)]
+    
+    def _write(f):
+        f.write('\n'.join(header))
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(names)
+        writer.writerows(zip(*cells))
+    
+    if n_rows < _SMALL_EXPORT_ROWS:
+        buf = io.StringIO()
+        _write(buf)
+        Path(fname).write_text(buf.getvalue())
+    else:
+        with open(fname, 'w', buffering=_EXPORT_BUFFER_SIZE) as f:
+            _write(f)
+
+
+@lru_cache(maxsize=8)
+def _spectrogram_window(nperseg: int) -> np.ndarray:
+    """Spectrogram's default Tukey(0.25) window as float32, shared read-only."""
+    window = signal.get_window(('tukey', 0.25), nperseg).astype(np.float32)
+    window.setflags(write=False)
+    return window
+
+
+class PeaksTableModel(QAbstractTableModel):
+    """Read-only table model backed directly by the peaks data arrays.
+    
+    Cells are formatted on demand in data(), so refreshing the table is a
+    model reset rather than one widget item per cell. Each column is
+    formatted in a single vectorized call the first time it is displayed.
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cols: List[str] = []
+        self._arrays: List[np.ndarray] = []
+        self._formatted: dict = {}
+        self._n_rows = 0
+    
+    def set_peaks_data(self, peaks_data: dict):
+        """Replace the backing arrays with new peaks data."""
+        self.beginResetModel()
+        self._cols = list(peaks_data.keys())
+        self._arrays = [np.asarray(values) for values in peaks_data.values()]
+        self._formatted = {}
+        self._n_rows = len(self._arrays[0]) if self._arrays else 0
+        self.endResetModel()
+    
+    def _column_text(self, col: int) -> np.ndarray:
+        """Display strings for a whole column, formatted once and cached."""
+        text = self._formatted.get(col)
+        if text is None:
+            values = self._arrays[col]
+            if values.dtype.kind == 'f':
+                text = np.char.mod('%.4f', values.astype(np.float64, copy=False))
+            else:
+                # Integers, booleans and object (string) columns
+                text = values.astype(str)
+            self._formatted[col] = text
+        return text
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._n_rows
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._cols)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        if role == Qt.DisplayRole:
+            return str(self._column_text(index.column())[index.row()])
+        if role == Qt.UserRole:
+            # Raw value so the proxy sorts numerically rather than as text
+            value = self._arrays[index.column()][index.row()]
+            return value.item() if isinstance(value, np.generic) else value
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._cols[section] if section < len(self._cols) else None
+        return str(section + 1)
 
 
 class PeaksTableDialog(QDialog):
@@ -88,11 +492,19 @@ class PeaksTableDialog(QDialog):
         self.status_label.setStyleSheet("color: gray; font-size: 10px;")
         layout.addWidget(self.status_label)
         
-        # Create table
-        self.table = QTableWidget()
+        # Create table (model/view, sorted through a proxy)
+        self.model = PeaksTableModel(self)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setSortRole(Qt.UserRole)
+        
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
         self.table.setAlternatingRowColors(True)
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table.setSortingEnabled(True)
+        self.table.sortByColumn(0, Qt.AscendingOrder)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
         self.table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self._show_context_menu)
         layout.addWidget(self.table)
@@ -101,7 +513,7 @@ class PeaksTableDialog(QDialog):
         btn_layout = QHBoxLayout()
         
         self.btn_refresh = QPushButton("🔄 Refresh Data")
-        self.btn_refresh.clicked.connect(self.refresh_data)
+        self.btn_refresh.clicked.connect(lambda: self.refresh_data(force=True))
         
         self.chk_auto_refresh = QCheckBox("Auto-refresh")
         self.chk_auto_refresh.setChecked(True)
@@ -126,6 +538,7 @@ class PeaksTableDialog(QDialog):
         layout.addLayout(btn_layout)
         
         self.peaks_data = {}
+        self._last_rendered_state = None  # Parent peaks state last shown
         
         # Add keyboard shortcut for copying (Ctrl+C)
         copy_shortcut = QShortcut(QKeySequence.Copy, self)
@@ -134,15 +547,23 @@ class PeaksTableDialog(QDialog):
         # Load initial data
         self.refresh_data()
     
-    def refresh_data(self):
-        """Refresh table with current peaks data from parent."""
+    def refresh_data(self, force: bool = False):
+        """Refresh table with current peaks data from parent.
+        
+        The rebuild is skipped when the parent's peaks are unchanged since the
+        last refresh, unless *force* is set (manual refresh).
+        """
+        state = self.parent_app._peaks_state()
+        if not force and state == self._last_rendered_state:
+            return
+        self._last_rendered_state = state
+        
         self.peaks_data = self.parent_app._get_current_peaks_data()
         self._populate_table(self.peaks_data)
         self._update_info_label()
         
         # Update status
-        import datetime
-        current_time = datetime.datetime.now().strftime("%H:%M:%S")
+        current_time = datetime.now().strftime("%H:%M:%S")
         if self.peaks_data:
             self.status_label.setText(f"Data refreshed at {current_time}")
         else:
@@ -154,8 +575,8 @@ class PeaksTableDialog(QDialog):
             self.info_label.setText("No peaks detected")
             return
         
-        n_peaks = len(list(self.peaks_data.values())[0])
-        timing_method = self.peaks_data.get('Timing_Method', ['unknown'])[0]
+        n_peaks = len(next(iter(self.peaks_data.values())))
+        timing_method = self.peaks_data.get('Timing_Method', _DEFAULT_TIMING)[0]
         
         # Get amplitude info
         amp_column = [k for k in self.peaks_data.keys() if k.startswith('Amplitude_')]
@@ -172,41 +593,19 @@ class PeaksTableDialog(QDialog):
     
     def _populate_table(self, peaks_data):
         """Fill table with peak data."""
-        if not peaks_data:
-            self.table.setRowCount(0)
-            self.table.setColumnCount(0)
-            return
-            
-        # Set up columns
-        columns = list(peaks_data.keys())
-        self.table.setColumnCount(len(columns))
-        self.table.setHorizontalHeaderLabels(columns)
-        
-        # Set up rows
-        n_peaks = len(list(peaks_data.values())[0])
-        self.table.setRowCount(n_peaks)
-        
-        # Fill data
-        for col_idx, (col_name, values) in enumerate(peaks_data.items()):
-            for row_idx, value in enumerate(values):
-                if isinstance(value, (float, np.floating)):
-                    item = QTableWidgetItem(f"{value:.4f}")
-                elif isinstance(value, (int, np.integer)):
-                    item = QTableWidgetItem(str(int(value)))
-                else:
-                    item = QTableWidgetItem(str(value))
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)  # Read-only
-                self.table.setItem(row_idx, col_idx, item)
+        self.model.set_peaks_data(peaks_data or {})
         
         # Auto-resize columns
-        self.table.resizeColumnsToContents()
-        header = self.table.horizontalHeader()
-        for i in range(len(columns)):
-            header.setSectionResizeMode(i, QHeaderView.Interactive)
+        if peaks_data:
+            self.table.resizeColumnsToContents()
+    
+    def _selected_rows(self) -> List[int]:
+        """Return selected rows (in displayed order) of the table view."""
+        return sorted(index.row() for index in self.table.selectionModel().selectedRows())
     
     def _copy_to_clipboard(self):
         """Copy table contents to clipboard in tab-separated format."""
-        if not self.peaks_data or self.table.rowCount() == 0:
+        if not self.peaks_data or self.proxy.rowCount() == 0:
             QMessageBox.warning(self, "No Data", "No data to copy!")
             return
         
@@ -215,50 +614,33 @@ class PeaksTableDialog(QDialog):
             clipboard = QApplication.clipboard()
             
             # Check if specific rows are selected
-            selected_rows = set()
-            for item in self.table.selectedItems():
-                selected_rows.add(item.row())
-            
-            # If no selection, copy all rows
-            if not selected_rows:
-                selected_rows = set(range(self.table.rowCount()))
-            
-            selected_rows = sorted(selected_rows)
-            
-            # Build tab-separated text
-            lines = []
+            selected_rows = self._selected_rows()
             
-            # Header row (always included)
-            headers = []
-            for col in range(self.table.columnCount()):
-                header_item = self.table.horizontalHeaderItem(col)
-                if header_item:
-                    headers.append(header_item.text())
-                else:
-                    headers.append(f"Column_{col}")
-            lines.append('\t'.join(headers))
+            import pandas as pd
             
-            # Data rows (only selected)
-            for row in selected_rows:
-                row_data = []
-                for col in range(self.table.columnCount()):
-                    item = self.table.item(row, col)
-                    if item:
-                        row_data.append(item.text())
-                    else:
-                        row_data.append('')
-                lines.append('\t'.join(row_data))
+            # Serialize the underlying arrays directly, in displayed order
+            df = pd.DataFrame(self.peaks_data)
+            if selected_rows:
+                source_rows = [self.proxy.mapToSource(self.proxy.index(row, 0)).row()
+                               for row in selected_rows]
+                df = df.iloc[source_rows]
+            else:
+                selected_rows = range(len(df))  # No selection: copy all rows
+                sort_col = self.proxy.sortColumn()
+                if 0 <= sort_col < df.shape[1]:
+                    df = df.sort_values(df.columns[sort_col], kind='stable',
+                                        ascending=self.proxy.sortOrder() == Qt.AscendingOrder)
             
-            # Join all lines
-            clipboard_text = '\n'.join(lines)
+            # Tab-separated text, same number format as the table
+            clipboard_text = df.to_csv(sep='\t', index=False, float_format='%.4f',
+                                       lineterminator='\n').rstrip('\n')
             
             # Copy to clipboard
             clipboard.setText(clipboard_text)
             
             # Show status feedback
-            import datetime
-            current_time = datetime.datetime.now().strftime("%H:%M:%S")
-            if len(selected_rows) == self.table.rowCount():
+            current_time = datetime.now().strftime("%H:%M:%S")
+            if len(selected_rows) == self.proxy.rowCount():
                 self.status_label.setText(f"Copied all data to clipboard at {current_time}")
                 rows_desc = "all rows"
             else:
@@ -268,7 +650,7 @@ class PeaksTableDialog(QDialog):
             # Show confirmation
             QMessageBox.information(
                 self, "Copied!", 
-                f"Copied {rows_desc} × {self.table.columnCount()} columns to clipboard.\n\n"
+                f"Copied {rows_desc} × {self.proxy.columnCount()} columns to clipboard.\n\n"
                 "You can now paste this data into Excel, statistical software, or any text editor.\n\n"
                 "Tip: Select specific rows before copying to copy only those rows."
             )
@@ -278,15 +660,13 @@ class PeaksTableDialog(QDialog):
     
     def _show_context_menu(self, position):
         """Show context menu when right-clicking on table."""
-        if self.table.itemAt(position) is None:
+        if not self.table.indexAt(position).isValid():
             return  # No item under cursor
         
         menu = QMenu(self)
         
         # Check if rows are selected
-        selected_rows = set()
-        for item in self.table.selectedItems():
-            selected_rows.add(item.row())
+        selected_rows = self._selected_rows()
         
         if selected_rows:
             copy_text = f"📋 Copy {len(selected_rows)} Selected Rows"
@@ -303,7 +683,7 @@ class PeaksTableDialog(QDialog):
         export_action.triggered.connect(self._export_table)
         
         refresh_action = menu.addAction("🔄 Refresh Data")
-        refresh_action.triggered.connect(self.refresh_data)
+        refresh_action.triggered.connect(lambda: self.refresh_data(force=True))
         
         menu.exec_(self.table.mapToGlobal(position))
     
@@ -314,23 +694,20 @@ class PeaksTableDialog(QDialog):
             return
             
         fname, _ = QFileDialog.getSaveFileName(
-            self, "Export Table", "peaks_table.csv", "CSV files (*.csv)"
+            self, "Export Table", self.parent_app._export_path("peaks_table.csv"), "CSV files (*.csv)"
         )
         if fname:
             try:
-                df = pd.DataFrame(self.peaks_data)
-                
                 # Add metadata
                 metadata = [
                     f"# Peaks Table Export",
-                    f"# Generated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                    f"# Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
                     f"# Source: {self.parent_app.current_file_path.name if self.parent_app.current_file_path else 'Unknown'}",
                     ""
                 ]
                 
-                with open(fname, 'w') as f:
-                    f.write('\n'.join(metadata))
-                    df.to_csv(f, index=False)
+                _write_csv_with_header(fname, metadata, self.peaks_data)
+                self.parent_app._remember_export_dir(fname)
                     
                 QMessageBox.information(self, "Export Complete", f"Table exported to:\n{fname}")
             except Exception as e:
@@ -344,9 +721,88 @@ class PeaksTableDialog(QDialog):
         event.accept()
 
 
+class TextDialog(QDialog):
+    """Read-only monospace text viewer for long information listings.
+    
+    QPlainTextEdit only lays out the visible lines, so long ABF listings
+    open as quickly as short ones, unlike a QMessageBox.
+    """
+    
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.resize(600, 500)
+        
+        layout = QVBoxLayout(self)
+        
+        font = QFont("Courier")
+        font.setStyleHint(QFont.Monospace)
+        self.text_edit = QPlainTextEdit()
+        self.text_edit.setReadOnly(True)
+        self.text_edit.setFont(font)
+        layout.addWidget(self.text_edit)
+        
+        btn_close = QPushButton("Close")
+        btn_close.clicked.connect(self.accept)
+        layout.addWidget(btn_close)
+    
+    def show_text(self, title: str, text: str):
+        """Replace the dialog contents and show it modally."""
+        self.setWindowTitle(title)
+        self.text_edit.setPlainText(text)
+        self.exec_()
+
+
 class PeakApp(QMainWindow):
     """CSV + ABF peak curator with low‑frequency analysis tools."""
 
+    # Export header templates, filled with str.format_map on each export
+    _METADATA_HEAD_TMPL = (
+        "# Peak Detection Results",
+        "# Generated by: Low-Mg²⁺ Peak Curator v1.4.1",
+        "# Export time: {export_time}",
+        "# Source file: {source}",
+        "#",
+        "# Signal Processing Pipeline:",
+        "{highpass}",
+    )
+    _METADATA_NOTCH_TMPL = "# - Notch filter: {notch_freq} Hz (Q={notch_q})"
+    _METADATA_SMOOTH_TMPL = "# - Smoothing: Savitzky-Golay window={smooth_window}"
+    _METADATA_BODY_TMPL = (
+        "#",
+        "# Peak Detection Parameters:",
+        "# - Peak polarity: {polarity}",
+        "# - Prominence threshold: {prominence} {units_label}",
+        "# - Minimum distance: {distance} ms",
+        "# - Width range: {min_width}-{max_width} ms",
+        "# - Sampling rate: {fs} Hz",
+        "# - Amplitude units: {units_label} (from processed signal)",
+        "# - Units conversion: {units_setting}",
+        "#",
+        "# Results:",
+        "# - Total peaks exported: {n_peaks}",
+        "# - Peaks removed by user: {n_removed}",
+        "# - Timing method: {timing_method}",
+        "#",
+        "# Measurement Details:",
+        "# - Processing: {filter_desc}",
+        "# - Amplitudes: Baseline-corrected from processed signal",
+        "# - Width: FWHM (Full Width at Half Maximum) with local baseline",
+        "# - Only peaks within width range [{min_width}-{max_width}ms] are included",
+    )
+    _METADATA_ABF_TMPL = (
+        "#",
+        "# ABF File Details:",
+        "# - Current sweep: {sweep}",
+        "# - Current channel: {channel}",
+        "# - Total sweeps: {sweep_count}",
+        "# - Total channels: {channel_count}",
+        "#",
+        "# Timing Explanation:",
+        "# - Time_Relative_s: Time within current sweep",
+        "# - Time_Absolute_s: Absolute time from experiment start",
+        "#   Example: Peak at 7s in sweep 4 with 30s sweeps = (30×3)+7 = 97s",
+    )
+
     # ────────────────────────────────────────────────────────────────
     # Construction / UI
     # ────────────────────────────────────────────────────────────────
@@ -361,18 +817,46 @@ class PeakApp(QMainWindow):
         self.traces: List[Tuple[np.ndarray, np.ndarray]] = []
         self.abf = None  # pyabf.ABF instance if mode == abf
         self.fs: Optional[float] = None  # sampling rate
+        self._sweep_times: Optional[np.ndarray] = None  # ABF sweep start times (s)
+        self._sweep_cache: OrderedDict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]] = OrderedDict()
 
         # Runtime state
         self.peaks_removed: set[int] = set()
         self.curated_peaks: Optional[np.ndarray] = None
+        self._peaks_version = 0  # Bumped whenever curated_peaks changes content
         self.current_file_path: Optional[Path] = None
 
+        # Units conversion, fixed when the units box changes (None = Auto-detect)
+        self._unit_factor: Optional[float] = None
+        self._unit_label: str = "mV"
+        self._auto_factor = 1.0
+        self._auto_factor_key = None
+
         # UI state
         self._table_dialog: Optional[PeaksTableDialog] = None
+        self._text_dialog: Optional[TextDialog] = None
+        
+        # Last export directory, persisted across sessions
+        self._settings = QSettings("Lab Tools", "Peak Curator")  # Same names main() sets
+        self._last_export_dir: str = self._settings.value("last_export_dir", "", type=str)
 
         # Cached data for performance
         self._cached_spectrogram = None
         self._cached_params = None
+        self._cached_spec_db: Optional[tuple] = None
+        self._filter_desc = ""
+        self._filter_desc_key = None
+        self._trace_label = ""
+        self._proc_cache: Optional[np.ndarray] = None
+        self._proc_cache_key = None
+        self._filter_coef_cache: OrderedDict = OrderedDict()  # SOS coefficients and windows keyed on design parameters
+        self._peak_baselines: Optional[tuple] = None
+        self._peaks_cache: Optional[tuple] = None
+        self._peaks_cache_key = None
+
+        # Coalesce bursts of parameter changes (e.g. held spin-box arrows)
+        self._debounce = QTimer(self, singleShot=True, interval=80)
+        self._debounce.timeout.connect(self._update_pipeline)
 
         # Build UI elements
         self._build_ui()
@@ -424,7 +908,8 @@ class PeakApp(QMainWindow):
         ctrl.addWidget(self.sb_sweep)
 
         # Peak detection params
-        self.sb_cut = QDoubleSpinBox(decimals=2, minimum=0.01, maximum=10, value=0.2, singleStep=0.01)
+        self.sb_cut = QDoubleSpinBox(decimals=2, minimum=0.0, maximum=10, value=0.2, singleStep=0.01)
+        self.sb_cut.setSpecialValueText("Off")  # 0 Hz: mean removal only
         self.sb_prom = QDoubleSpinBox(decimals=3, minimum=0.001, maximum=10, value=0.05, singleStep=0.005)
         self.sb_dist = QSpinBox(minimum=5, maximum=2000, value=50, singleStep=5)
         for w in (self.sb_cut, self.sb_prom, self.sb_dist):
@@ -437,7 +922,7 @@ class PeakApp(QMainWindow):
         ctrl.addWidget(self.sb_dist)
 
         # Peak width filtering
-        self.sb_min_width = QSpinBox(minimum=1, maximum=1000, value=5, singleStep=1)
+        self.sb_min_width = QSpinBox(minimum=0, maximum=1000, value=5, singleStep=1)
         self.sb_max_width = QSpinBox(minimum=1, maximum=1000, value=500, singleStep=10)
         for w in (self.sb_min_width, self.sb_max_width):
             w.valueChanged.connect(self._param_changed)
@@ -469,6 +954,12 @@ class PeakApp(QMainWindow):
         ctrl2.addWidget(self.chk_smooth)
         ctrl2.addWidget(self.sb_smooth_window)
 
+        # One-pass high-pass (half the work of zero-phase, but not phase-neutral)
+        self.chk_fast_hp = QCheckBox("Fast HP")
+        self.chk_fast_hp.stateChanged.connect(self._param_changed)
+        self.chk_fast_hp.setToolTip("Single-pass high-pass filter: faster, but not zero-phase,\nso peak positions and shapes can shift")
+        ctrl2.addWidget(self.chk_fast_hp)
+
         # 50Hz notch filter
         self.chk_notch = QCheckBox("50Hz Filter")
         self.chk_notch.stateChanged.connect(self._param_changed)
@@ -489,7 +980,7 @@ class PeakApp(QMainWindow):
         self.sb_lowF = QDoubleSpinBox(decimals=2, minimum=0, maximum=100, value=0.0, singleStep=0.1)
         self.sb_hiF = QDoubleSpinBox(decimals=2, minimum=0.1, maximum=500, value=10.0, singleStep=0.1)
         for w in (self.sb_lowF, self.sb_hiF):
-            w.valueChanged.connect(self._update_plots)
+            w.valueChanged.connect(self._refresh_frequency_plots)
         self.chk_spec = QCheckBox("Spectrogram")
         self.chk_spec.stateChanged.connect(self._toggle_spectrogram)
         ctrl.addWidget(QLabel("Low F:"))
@@ -500,7 +991,7 @@ class PeakApp(QMainWindow):
         self.cb_units = QComboBox()
         self.cb_units.addItems(["Auto", "mV", "µV", "V"])
         self.cb_units.setCurrentText("Auto")
-        self.cb_units.currentTextChanged.connect(self._update_plots)
+        self.cb_units.currentTextChanged.connect(self._units_changed)
         self.cb_units.setToolTip("Units for amplitude display and export")
         
         ctrl.addWidget(QLabel("Units:"))
@@ -530,13 +1021,26 @@ class PeakApp(QMainWindow):
         self.glw = pg.GraphicsLayoutWidget()
         vbox.addWidget(self.glw)
 
-        # Raw/filtered trace
+        # Shared pens/brushes (built once, reused on every refresh)
+        self._trace_pen = pg.mkPen("#268bd2", width=1)
+        self._power_pen = pg.mkPen("#d33682", width=2)
+        self._peak_brush = pg.mkBrush(255, 0, 0, 180)
+        self._peak_pen = pg.mkPen(255, 255, 255, 200)
+        self._removed_brush = pg.mkBrush(128, 128, 128, 100)
+        self._removed_pen = pg.mkPen(128, 128, 128, 150)
+
+        # Raw/filtered trace (peak-preserving downsampling, draw visible range only)
         self.plot_trace = self.glw.addPlot(row=0, col=0)
         self.plot_trace.setLabel("left", "mV (HP)")
         self.plot_trace.setLabel("bottom", "Time", units="s")
+        self.plot_trace.setDownsampling(auto=True, mode="peak")
+        self.plot_trace.setClipToView(True)
         self.scatter = pg.ScatterPlotItem()
         self.scatter.sigClicked.connect(self._peak_clicked)
         self.plot_trace.addItem(self.scatter)
+        self.scatter_removed = pg.ScatterPlotItem()
+        self.scatter_removed.sigClicked.connect(self._peak_clicked)  # Click again to restore
+        self.plot_trace.addItem(self.scatter_removed)
 
         # Band‑power trace (mean power in [lowF, hiF])
         self.plot_power = self.glw.addPlot(row=1, col=0)
@@ -550,6 +1054,7 @@ class PeakApp(QMainWindow):
         self.plot_spec.setXLink(self.plot_trace)
         self.plot_spec.setLabel("left", "Frequency", units="Hz")
         self._spec_img = pg.ImageItem()
+        self._spec_img.setLookupTable(pg.colormap.get("viridis").getLookupTable(nPts=256))
         self.plot_spec.addItem(self._spec_img)
 
         # Peaks timeline (appears after export)
@@ -581,9 +1086,19 @@ class PeakApp(QMainWindow):
             # Clear previous state
             self.peaks_removed.clear()
             self.curated_peaks = None
+            self._peaks_version += 1
             self.current_file_path = path
             self._cached_spectrogram = None
             self._cached_params = None
+            self._cached_spec_db = None
+            self._proc_cache = None
+            self._proc_cache_key = None
+            self._peak_baselines = None
+            self._peaks_cache = None
+            self._peaks_cache_key = None
+            self._auto_factor_key = None
+            self._sweep_times = None
+            self._sweep_cache.clear()
             
             if path.suffix.lower() == ".csv":
                 self.mode = "csv"
@@ -600,6 +1115,7 @@ class PeakApp(QMainWindow):
                 
             # Update plots after successful load
             self._update_plots()
+            self._debounce.stop()  # Selector resets during load are already applied
             
         except Exception as e:
             QMessageBox.critical(self, "Error loading file", f"Failed to load {path.name}:\n{str(e)}")
@@ -607,21 +1123,31 @@ class PeakApp(QMainWindow):
 
     def _load_csv(self, path: Path):
         """Load CSV file - expects time, voltage columns."""
-        df = pd.read_csv(path)
+        import pandas as pd  # Deferred: only CSV loading and copying need pandas
         
-        if df.shape[1] < 2:
+        try:
+            # Fast path: C parser straight into a single float block (no column inference)
+            data = pd.read_csv(path, engine='c', dtype=np.float64).to_numpy()
+        except ValueError:
+            # Non-numeric columns present: convert only the time/voltage columns
+            # used below, so they stay float64 instead of an object array
+            data = pd.read_csv(path).iloc[:, :4].apply(pd.to_numeric, errors='coerce').to_numpy(np.float64)
+        
+        if data.ndim != 2 or data.shape[1] < 2:
             raise ValueError("CSV must have at least 2 columns (time, voltage)")
         
         # Handle different CSV formats
-        if df.shape[1] == 2:
+        # Voltages are kept as float32 (halves memory traffic downstream);
+        # time stays float64 so long recordings keep sub-sample resolution.
+        if data.shape[1] == 2:
             # Single trace
-            self.traces = [(df.iloc[:, 0].values, df.iloc[:, 1].values)]
+            self.traces = [(data[:, 0], data[:, 1].astype(np.float32))]
             trace_names = ["Recording 1"]
-        elif df.shape[1] >= 4:
+        elif data.shape[1] >= 4:
             # Multiple traces (assume paired columns)
             self.traces = [
-                (df.iloc[:, 0].values, df.iloc[:, 1].values),
-                (df.iloc[:, 2].values, df.iloc[:, 3].values)
+                (data[:, 0], data[:, 1].astype(np.float32)),
+                (data[:, 2], data[:, 3].astype(np.float32))
             ]
             trace_names = ["Recording 1", "Recording 2"]
         else:
@@ -633,10 +1159,10 @@ class PeakApp(QMainWindow):
         self.sb_chan.setEnabled(False)
         self.sb_sweep.setEnabled(False)
         
-        # Calculate sampling rate
+        # Calculate sampling rate (mean sample spacing in closed form, no np.diff array)
         t = self.traces[0][0]
-        if len(t) > 1:
-            self.fs = float(1 / np.mean(np.diff(t)))
+        if len(t) > 1 and t[-1] != t[0]:
+            self.fs = float((len(t) - 1) / (t[-1] - t[0]))
         else:
             self.fs = 1000.0  # Default fallback
             
@@ -648,6 +1174,10 @@ class PeakApp(QMainWindow):
             self.abf = pyabf.ABF(str(path))
             self.fs = float(self.abf.dataRate)
             
+            # Cache sweep start times once instead of querying pyabf per refresh
+            sweep_times = getattr(self.abf, 'sweepTimesSec', None)
+            self._sweep_times = None if sweep_times is None else np.asarray(sweep_times, dtype=np.float64)
+            
             # Enable channel & sweep selectors
             self.sb_chan.setEnabled(True)
             self.sb_sweep.setEnabled(True)
@@ -685,13 +1215,9 @@ class PeakApp(QMainWindow):
         if self.abf is None:
             return relative_times, "no_abf"
         
-        # Method 1: Try sweepTimesSec (most accurate)
-        if hasattr(self.abf, 'sweepTimesSec') and len(self.abf.sweepTimesSec) > sweep_num:
-            try:
-                sweep_start = self.abf.sweepTimesSec[sweep_num]
-                return sweep_start + relative_times, "sweepTimesSec"
-            except (IndexError, TypeError):
-                pass
+        # Method 1: Try sweepTimesSec (most accurate, cached at load)
+        if self._sweep_times is not None and len(self._sweep_times) > sweep_num:
+            return self._sweep_times[sweep_num] + relative_times, "sweepTimesSec"
         
         # Method 2: Try sweepLengthSec
         if hasattr(self.abf, 'sweepLengthSec'):
@@ -723,7 +1249,7 @@ class PeakApp(QMainWindow):
             return {}
         
         # Apply complete signal processing pipeline (same as display)
-        v_processed = self._process_signal(v_original)
+        v_processed = self._processed_signal(v_original)
         
         # Peak times from relative trace
         peak_times_rel = t_relative[self.curated_peaks]
@@ -742,86 +1268,90 @@ class PeakApp(QMainWindow):
         peak_times_abs, timing_method = self._get_absolute_timing(peak_times_rel, current_sweep)
         
         # Build comprehensive data dictionary
+        n_peaks = len(self.curated_peaks)
         peaks_data = {
             'Peak_Index': self.curated_peaks,
             'Time_Relative_s': peak_times_rel,
             'Time_Absolute_s': peak_times_abs,
             f'Amplitude_{units_label}': peak_amplitudes_converted,
             'Width_ms': peak_widths * 1000,  # Convert to milliseconds
-            'Timing_Method': [timing_method] * len(self.curated_peaks)
+            'Timing_Method': np.full(n_peaks, timing_method, dtype=object)
         }
         
-        # Add ABF-specific information
+        # Add ABF-specific information. These are constant, so the columns are
+        # read-only broadcast views rather than filled arrays; they stay in the
+        # data so the table and clipboard rows carry them too.
         if self.mode == "abf":
-            peaks_data['Sweep_Number'] = [current_sweep] * len(self.curated_peaks)
-            peaks_data['Channel_Number'] = [self.sb_chan.value()] * len(self.curated_peaks)
-            peaks_data['Sampling_Rate_Hz'] = [self.fs] * len(self.curated_peaks)
+            peaks_data['Sweep_Number'] = np.broadcast_to(np.int32(current_sweep), n_peaks)
+            peaks_data['Channel_Number'] = np.broadcast_to(np.int32(self.sb_chan.value()), n_peaks)
+            peaks_data['Sampling_Rate_Hz'] = np.broadcast_to(np.float64(self.fs), n_peaks)
         
         return peaks_data
     
-    def _calculate_peak_widths(self, signal: np.ndarray, peak_indices: np.ndarray) -> np.ndarray:
+    def _baseline_windows(self, min_window: int) -> Tuple[int, int]:
+        """Baseline window and its gap from the peak, in samples (100ms window)."""
+        baseline_window = max(min_window, int(0.1 * self.fs))
+        baseline_distance = max(min_window // 2, baseline_window // 4)
+        return baseline_window, baseline_distance
+    
+    def _compute_peak_baselines(self, signal: np.ndarray, peak_indices: np.ndarray,
+                                baseline_window: int, baseline_distance: int) -> np.ndarray:
+        """Local median baseline either side of each peak.
+        
+        Widths and amplitudes measure against the same baselines, so the last
+        result for the processed trace is kept and any sorted subset of its
+        peaks (e.g. the curated peaks after width filtering) is served from it.
+        """
+        peaks = np.asarray(peak_indices, dtype=np.int64)
+        key = (self._proc_cache_key, baseline_window, baseline_distance) if signal is self._proc_cache else None
+        
+        if key is not None and self._peak_baselines is not None and self._peak_baselines[0] == key:
+            _, cached_peaks, cached_baselines = self._peak_baselines
+            pos = np.searchsorted(cached_peaks, peaks)
+            if np.all(pos < len(cached_peaks)) and np.array_equal(cached_peaks[np.minimum(pos, len(cached_peaks) - 1)], peaks):
+                return cached_baselines[pos]
+        
+        if numba is not None:
+            v = np.ascontiguousarray(signal, dtype=np.float32)
+            baselines = np.empty(len(peaks), dtype=v.dtype)
+            _baseline_kernel(v, peaks, baseline_window, baseline_distance, baselines)
+        else:
+            baselines = _median_baselines(signal, peaks, baseline_window, baseline_distance)
+        
+        if key is not None:
+            self._peak_baselines = (key, peaks, baselines)
+        return baselines
+    
+    def _calculate_peak_widths(self, signal: np.ndarray, peak_indices: np.ndarray,
+                               baselines: Optional[np.ndarray] = None) -> np.ndarray:
         """Calculate peak widths at half maximum (FWHM) in seconds."""
         if len(peak_indices) == 0:
             return np.array([])
         
-        widths = []
+        peaks = np.asarray(peak_indices, dtype=np.int64)
+        if baselines is None:
+            baselines = self._compute_peak_baselines(signal, peaks, *self._baseline_windows(20))
+        max_search = int(0.5 * self.fs)  # 500ms max
         
-        for peak_idx in peak_indices:
-            peak_value = signal[peak_idx]
-            
-            # Calculate local baseline around peak
-            baseline_window = max(20, int(0.1 * self.fs))  # 100ms window
-            baseline_distance = max(10, baseline_window // 4)
-            
-            # Get baseline regions
-            left_start = max(0, peak_idx - baseline_window - baseline_distance)
-            left_end = max(0, peak_idx - baseline_distance)
-            right_start = min(len(signal), peak_idx + baseline_distance)
-            right_end = min(len(signal), peak_idx + baseline_window + baseline_distance)
-            
-            # Calculate baseline
-            baseline_values = []
-            if left_end > left_start:
-                baseline_values.extend(signal[left_start:left_end])
-            if right_end > right_start:
-                baseline_values.extend(signal[right_start:right_end])
-            
-            if baseline_values:
-                baseline = np.median(baseline_values)
-            else:
-                baseline = np.mean(signal[max(0, peak_idx-5):min(len(signal), peak_idx+6)])
-            
-            # Half maximum level
-            half_max = baseline + (peak_value - baseline) / 2
-            
-            # Find points where signal crosses half maximum
-            # Search window around peak
-            search_window = min(peak_idx, len(signal) - peak_idx - 1, int(0.5 * self.fs))  # 500ms max
-            
-            left_idx = peak_idx
-            right_idx = peak_idx
-            
-            # Find left crossing
-            for i in range(peak_idx, max(0, peak_idx - search_window), -1):
-                if signal[i] <= half_max:
-                    left_idx = i
-                    break
-            
-            # Find right crossing  
-            for i in range(peak_idx, min(len(signal), peak_idx + search_window)):
-                if signal[i] <= half_max:
-                    right_idx = i
-                    break
-            
-            # Calculate width in seconds
-            width_samples = right_idx - left_idx
-            width_seconds = width_samples / self.fs if self.fs else 0
-            
-            widths.append(width_seconds)
+        if numba is not None:
+            widths = np.empty(len(peaks), dtype=np.float64)
+            _fwhm_kernel(
+                np.ascontiguousarray(signal, dtype=np.float32), peaks,
+                np.ascontiguousarray(baselines), float(self.fs), max_search, widths,
+            )
+            return widths
         
-        return np.array(widths)
+        # Vectorized NumPy path: chunked search for the half-maximum
+        # crossings either side of every peak
+        half_max = baselines + (signal[peaks] - baselines) / 2
+        search_window = np.minimum(np.minimum(peaks, len(signal) - peaks - 1), max_search)
+        
+        left = _first_crossing(signal, peaks, half_max, search_window, -1)
+        right = _first_crossing(signal, peaks, half_max, search_window, 1)
+        return (left + right) / self.fs
     
-    def _calculate_peak_amplitudes(self, signal: np.ndarray, peak_indices: np.ndarray) -> np.ndarray:
+    def _calculate_peak_amplitudes(self, signal: np.ndarray, peak_indices: np.ndarray,
+                                   baselines: Optional[np.ndarray] = None) -> np.ndarray:
         """Calculate baseline-corrected peak amplitudes.
         
         Uses local baseline estimation around each peak for more accurate amplitude measurement.
@@ -829,44 +1359,11 @@ class PeakApp(QMainWindow):
         if len(peak_indices) == 0:
             return np.array([])
         
-        amplitudes = []
-        
-        # Window size for baseline calculation (in samples)
-        baseline_window = max(10, int(0.1 * self.fs))  # 100ms or 10 samples, whichever is larger
-        
-        for peak_idx in peak_indices:
-            peak_value = signal[peak_idx]
-            
-            # Define baseline region (before and after peak, but not too close)
-            baseline_distance = max(5, baseline_window // 4)
-            
-            # Get baseline regions (avoiding the peak itself)
-            left_start = max(0, peak_idx - baseline_window - baseline_distance)
-            left_end = max(0, peak_idx - baseline_distance)
-            right_start = min(len(signal), peak_idx + baseline_distance)
-            right_end = min(len(signal), peak_idx + baseline_window + baseline_distance)
-            
-            # Calculate baseline from regions around the peak
-            baseline_values = []
-            if left_end > left_start:
-                baseline_values.extend(signal[left_start:left_end])
-            if right_end > right_start:
-                baseline_values.extend(signal[right_start:right_end])
-            
-            if baseline_values:
-                # Use median for robust baseline estimation
-                baseline = np.median(baseline_values)
-                amplitude = peak_value - baseline
-            else:
-                # Fallback: use local mean if no baseline region available
-                window_start = max(0, peak_idx - 5)
-                window_end = min(len(signal), peak_idx + 6)
-                local_baseline = np.mean(signal[window_start:window_end])
-                amplitude = peak_value - local_baseline
-            
-            amplitudes.append(amplitude)
-        
-        return np.array(amplitudes)
+        peaks = np.asarray(peak_indices, dtype=np.int64)
+        if baselines is None:
+            # 100ms or 10 samples, whichever is larger
+            baselines = self._compute_peak_baselines(signal, peaks, *self._baseline_windows(10))
+        return signal[peaks] - baselines
     
     def _convert_units(self, values: np.ndarray, to_unit: str = None) -> Tuple[np.ndarray, str]:
         """Convert amplitude units and return (converted_values, unit_label).
@@ -874,20 +1371,14 @@ class PeakApp(QMainWindow):
         Auto mode tries to detect appropriate units based on signal range.
         """
         if to_unit is None:
-            to_unit = self.cb_units.currentText()
+            factor = self._unit_factor
+            if factor is None:
+                factor = self._auto_unit_factor()
+            return (values if factor == 1.0 else values * factor), self._unit_label
         
         if to_unit == "Auto":
-            # Auto-detect based on signal magnitude
-            max_val = np.max(np.abs(values)) if len(values) > 0 else 1.0
-            
-            if max_val > 1000:  # Likely µV, convert to mV
-                return values / 1000, "mV"
-            elif max_val > 10:  # Likely mV, keep as is
-                return values, "mV"  
-            elif max_val > 0.01:  # Likely V, convert to mV
-                return values * 1000, "mV"
-            else:  # Very small values, might be V
-                return values * 1000, "mV"
+            factor = self._auto_unit_factor()
+            return (values if factor == 1.0 else values * factor), "mV"
         
         elif to_unit == "µV":
             return values, "µV"
@@ -898,6 +1389,26 @@ class PeakApp(QMainWindow):
         
         return values, "units"
     
+    def _auto_unit_factor(self) -> float:
+        """Scale factor to mV for Auto units, detected once per trace.
+        
+        Based on the magnitude of the raw current trace, so it does not depend
+        on which peaks happen to be curated.
+        """
+        key = (self.current_file_path, self._trace_key())
+        if self._auto_factor_key != key:
+            _, v = self._get_current_trace()
+            max_val = max(float(np.max(v)), -float(np.min(v))) if len(v) > 0 else 1.0
+            
+            if max_val > 1000:  # Likely µV, convert to mV
+                self._auto_factor = 1e-3
+            elif max_val > 10:  # Likely mV, keep as is
+                self._auto_factor = 1.0
+            else:  # Likely V, convert to mV
+                self._auto_factor = 1000.0
+            self._auto_factor_key = key
+        return self._auto_factor
+    
     def _debug_signal_info(self, signal: np.ndarray, label: str = "Signal"):
         """Print debugging information about signal characteristics."""
         if len(signal) == 0:
@@ -934,31 +1445,77 @@ class PeakApp(QMainWindow):
             if self.abf is None:
                 return np.array([]), np.array([])
                 
-            self.abf.setSweep(sweep, channel=chan)
-            return self.abf.sweepX, self.abf.sweepY
+            return self._get_sweep(chan, sweep)
             
         except Exception as e:
             print(f"Error getting trace data: {e}")
             return np.array([]), np.array([])
 
-    @staticmethod
-    def _highpass(x: np.ndarray, fs: float, cutoff: float, order: int = 3) -> np.ndarray:
-        """Apply high-pass Butterworth filter."""
+    def _get_sweep(self, chan: int, sweep: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (time, data) for an ABF channel/sweep, caching recently used sweeps.
+        
+        pyabf's setSweep() rebuilds the sweep (and command waveform) on every
+        call; parameter tweaks that keep the same sweep are served from RAM.
+        The time axis is stored with the data, since abf.sweepX only describes
+        whichever sweep was loaded last; sweeps of equal length share one array.
+        """
+        key = (chan, sweep)
+        cached = self._sweep_cache.get(key)
+        if cached is not None:
+            self._sweep_cache.move_to_end(key)
+            return cached
+        
+        self.abf.setSweep(sweep, channel=chan)
+        v = np.asarray(self.abf.sweepY, dtype=np.float32)
+        x = next((t for t, _ in self._sweep_cache.values() if len(t) == len(v)), self.abf.sweepX)
+        self._sweep_cache[key] = (x, v)
+        if len(self._sweep_cache) > _SWEEP_CACHE_SIZE:
+            self._sweep_cache.popitem(last=False)
+        return x, v
+
+    def _filter_coefs(self, key: tuple, design):
+        """Return cached filter design for *key* (SOS coefficients), designing it on a miss."""
+        sos = self._filter_coef_cache.get(key)
+        if sos is not None:
+            self._filter_coef_cache.move_to_end(key)
+            return sos
+        
+        sos = design()
+        self._filter_coef_cache[key] = sos
+        if len(self._filter_coef_cache) > _FILTER_CACHE_SIZE:
+            self._filter_coef_cache.popitem(last=False)
+        return sos
+
+    def _highpass(self, x: np.ndarray, fs: float, cutoff: float, order: int = 3,
+                  fast: bool = False) -> np.ndarray:
+        """Apply high-pass Butterworth filter (second-order sections).
+        
+        Zero-phase by default. With *fast* the filter runs once forwards at
+        half the cost; its phase response is not compensated, so peaks can
+        shift and change shape depending on the cutoff and the peak width.
+        """
         if cutoff >= fs / 2:
             cutoff = fs / 2 - 0.1  # Avoid Nyquist frequency issues
-        b, a = signal.butter(order, cutoff / (0.5 * fs), "highpass")
-        return signal.filtfilt(b, a, x)
+        
+        sos = self._filter_coefs(
+            ("highpass", fs, cutoff, order),
+            lambda: signal.butter(order, cutoff / (0.5 * fs), "highpass", output="sos"),
+        )
+        if not fast:
+            return signal.sosfiltfilt(sos, x)
+        return signal.sosfilt(sos, x)
 
-    @staticmethod
-    def _notch_filter(x: np.ndarray, fs: float, freq: float, quality: float = 30.0) -> np.ndarray:
+    def _notch_filter(self, x: np.ndarray, fs: float, freq: float, quality: float = 30.0) -> np.ndarray:
         """Apply notch filter to remove specific frequency (e.g., 50Hz power line noise)."""
         if freq >= fs / 2:
             return x  # Can't filter above Nyquist
         
-        # Calculate filter parameters
         w0 = freq / (fs / 2)  # Normalized frequency
-        b, a = signal.iirnotch(w0, quality)
-        return signal.filtfilt(b, a, x)
+        sos = self._filter_coefs(
+            ("notch", fs, freq, quality),
+            lambda: signal.tf2sos(*signal.iirnotch(w0, quality)),
+        )
+        return signal.sosfiltfilt(sos, x)
 
     @staticmethod
     def _smooth_signal(x: np.ndarray, window_length: int = 5, polyorder: int = 2) -> np.ndarray:
@@ -976,12 +1533,20 @@ class PeakApp(QMainWindow):
         return signal.savgol_filter(x, window_length, polyorder)
 
     def _process_signal(self, x: np.ndarray) -> np.ndarray:
-        """Apply complete signal processing pipeline."""
-        processed = x.copy()
+        """Apply complete signal processing pipeline.
         
-        # Step 1: High-pass filter (always applied)
+        Every stage returns a new array (the high-pass stage always runs), so
+        the raw trace is never modified and needs no defensive copy.
+        """
+        processed = x
+        
+        # Step 1: High-pass filter (a 0 Hz cutoff only removes the mean; a
+        # Butterworth that close to DC is slow to settle and ill-conditioned)
         cutoff = self.sb_cut.value()
-        processed = self._highpass(processed, self.fs, cutoff)
+        if cutoff > 0:
+            processed = self._highpass(processed, self.fs, cutoff, fast=self.chk_fast_hp.isChecked())
+        else:
+            processed = processed - processed.mean(dtype=np.float64)
         
         # Step 2: Notch filter (if enabled)
         if self.chk_notch.isChecked():
@@ -994,6 +1559,44 @@ class PeakApp(QMainWindow):
             smooth_window = self.sb_smooth_window.value()
             processed = self._smooth_signal(processed, smooth_window)
         
+        # Filters run in float64 for stability; everything downstream (peak
+        # search, per-peak kernels, spectrogram, plotting) works on float32.
+        return processed.astype(np.float32, copy=False)
+
+    def _trace_key(self) -> tuple:
+        """Identify the currently selected trace (CSV trace or ABF channel/sweep)."""
+        if self.mode == "abf":
+            return ("abf", self.sb_chan.value(), self.sb_sweep.value())
+        return ("csv", self.cb_trace.currentIndex())
+
+    def _processing_key(self) -> tuple:
+        """Key identifying the current trace plus every processing parameter."""
+        return (
+            self._trace_key(),
+            self.fs,
+            self.sb_cut.value(),
+            self.chk_fast_hp.isChecked(),
+            self.chk_notch.isChecked(),
+            self.sb_notch_freq.value(),
+            self.sb_notch_q.value(),
+            self.chk_smooth.isChecked(),
+            self.sb_smooth_window.value(),
+        )
+
+    def _processed_signal(self, x: np.ndarray) -> np.ndarray:
+        """Return the processed current trace, reusing the last pipeline pass.
+        
+        Peak detection, amplitudes, widths and the spectrogram all work on the
+        same processed trace, so the filter cascade only runs when the trace or
+        a processing parameter changes.
+        """
+        key = self._processing_key()
+        if self._proc_cache is not None and self._proc_cache_key == key and len(self._proc_cache) == len(x):
+            return self._proc_cache
+        
+        processed = self._process_signal(x)
+        self._proc_cache = processed
+        self._proc_cache_key = key
         return processed
 
     def _detect_peaks(self, trace_processed: np.ndarray, prom: float, dist_ms: int):
@@ -1004,20 +1607,27 @@ class PeakApp(QMainWindow):
         dist = int(dist_ms / 1000 * self.fs)
         polarity = self.cb_polarity.currentText()
         
+        # Peak removal, units and plot toggles redraw without touching any of
+        # these, so the last detection is reused for the cached processed trace
+        key = (self._proc_cache_key, prom, dist_ms, polarity,
+               self.sb_min_width.value(), self.sb_max_width.value())
+        if trace_processed is self._proc_cache and self._peaks_cache_key == key:
+            return self._peaks_cache
+        
         if polarity == "Positive":
             # Detect positive peaks
-            peaks, properties = signal.find_peaks(trace_processed, prominence=prom, distance=dist)
+            peaks, properties = self._find_peaks(trace_processed, prom, dist)
         elif polarity == "Negative":
-            # Detect negative peaks (invert signal)
-            peaks, properties = signal.find_peaks(-trace_processed, prominence=prom, distance=dist)
+            # Detect negative peaks (troughs of the signal)
+            peaks, properties = self._find_peaks(trace_processed, prom, dist, sign=-1.0)
         else:  # Both
             # Detect both positive and negative peaks
-            pos_peaks, pos_props = signal.find_peaks(trace_processed, prominence=prom, distance=dist)
-            neg_peaks, neg_props = signal.find_peaks(-trace_processed, prominence=prom, distance=dist)
+            pos_peaks, pos_props = self._find_peaks(trace_processed, prom, dist)
+            neg_peaks, neg_props = self._find_peaks(trace_processed, prom, dist, sign=-1.0)
             
-            # Combine peaks and sort by position
+            # Combine peaks and sort by position (maxima and minima never coincide)
             all_peaks = np.concatenate([pos_peaks, neg_peaks])
-            sort_idx = np.argsort(all_peaks)
+            sort_idx = np.argsort(all_peaks, kind='stable')
             peaks = all_peaks[sort_idx]
             
             # Combine properties (simplified)
@@ -1026,10 +1636,26 @@ class PeakApp(QMainWindow):
         
         # Filter by width if we have peaks
         if len(peaks) > 0:
-            peaks = self._filter_peaks_by_width(trace_processed, peaks)
-        
+            filtered = self._filter_peaks_by_width(trace_processed, peaks)
+            if len(filtered) < len(peaks):
+                # Keep per-peak properties aligned with the surviving peaks
+                kept = np.searchsorted(peaks, filtered)
+                properties = {name: values[kept] for name, values in properties.items()}
+            peaks = filtered
+        
+        if trace_processed is self._proc_cache:
+            self._peaks_cache = (peaks, properties)
+            self._peaks_cache_key = key
         return peaks, properties
 
+    @staticmethod
+    def _find_peaks(x: np.ndarray, prom: float, dist: int, sign: float = 1.0) -> Tuple[np.ndarray, dict]:
+        """Prominence/distance peak search on *sign* * *x*, on the compiled kernels when available."""
+        if numba is not None and dist >= 1:
+            peaks, prominences = _find_peaks_fast(x, prom, dist, sign)
+            return peaks, {'prominences': prominences}
+        return signal.find_peaks(x if sign > 0 else -x, prominence=prom, distance=dist)
+
     def _filter_peaks_by_width(self, signal: np.ndarray, peaks: np.ndarray) -> np.ndarray:
         """Filter peaks based on width criteria."""
         if len(peaks) == 0:
@@ -1038,6 +1664,11 @@ class PeakApp(QMainWindow):
         min_width_ms = self.sb_min_width.value()
         max_width_ms = self.sb_max_width.value()
         
+        # Widths are searched at most 500ms either side of the peak, so a
+        # 0-1000ms range keeps everything and the width pass can be skipped
+        if min_width_ms <= 0 and max_width_ms >= 1000:
+            return peaks
+        
         # Convert to seconds
         min_width_s = min_width_ms / 1000
         max_width_s = max_width_ms / 1000
@@ -1052,8 +1683,18 @@ class PeakApp(QMainWindow):
         return filtered_peaks
 
     def _compute_spectrogram(self, trace_hp: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-        """Compute spectrogram with caching."""
-        current_params = (len(trace_hp), self.fs)
+        """Compute spectrogram with caching.
+        
+        Keyed on the processing key when given the cached processed trace, so
+        a new trace or filter setting invalidates it even at equal length;
+        other arrays fall back to a cheap address/length/endpoint fingerprint.
+        """
+        if trace_hp is self._proc_cache:
+            current_params = ("processed", self._proc_cache_key, self.fs)
+        elif len(trace_hp) > 0:
+            current_params = (trace_hp.ctypes.data, len(trace_hp), trace_hp[0], trace_hp[-1], self.fs)
+        else:
+            current_params = (0, 0, self.fs)
         
         if (self._cached_spectrogram is not None and 
             self._cached_params == current_params):
@@ -1066,7 +1707,10 @@ class PeakApp(QMainWindow):
         if nperseg < 4:
             nperseg = 4
             
-        f, tt, Sxx = signal.spectrogram(trace_hp, self.fs, nperseg=nperseg)
+        # Same default Tukey window, but float32 so the FFT stays single precision
+        window = _spectrogram_window(nperseg)
+        f, tt, Sxx = signal.spectrogram(np.asarray(trace_hp, dtype=np.float32), self.fs,
+                                        window=window, nperseg=nperseg)
         
         # Cache results
         self._cached_spectrogram = (f, tt, Sxx)
@@ -1074,6 +1718,16 @@ class PeakApp(QMainWindow):
         
         return f, tt, Sxx
 
+    def _spectrogram_db(self, Sxx: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """dB image of a spectrogram and its display levels, cached with it."""
+        if self._cached_spec_db is None or self._cached_spec_db[0] is not Sxx:
+            Sxx_db = np.add(Sxx, 1e-10, dtype=np.float32)
+            np.log10(Sxx_db, out=Sxx_db)
+            Sxx_db *= 10
+            levels = np.percentile(Sxx_db, (2, 98))
+            self._cached_spec_db = (Sxx, Sxx_db, levels)
+        return self._cached_spec_db[1], self._cached_spec_db[2]
+
     def _compute_band_power(self, f: np.ndarray, tt: np.ndarray, Sxx: np.ndarray, 
                            low_f: float, hi_f: float) -> np.ndarray:
         """Compute band power in frequency range."""
@@ -1094,7 +1748,11 @@ class PeakApp(QMainWindow):
     # ------------------------------------------------------------------
 
     def _param_changed(self, *_):
-        """Handle parameter changes."""
+        """Handle parameter changes (debounced until the widgets settle)."""
+        self._debounce.start()
+
+    def _update_pipeline(self):
+        """Re-run filtering, detection and plotting for the settled parameters."""
         self.peaks_removed.clear()
         self._update_plots()
 
@@ -1106,6 +1764,16 @@ class PeakApp(QMainWindow):
         else:
             self._param_changed()
 
+    def _units_changed(self, units: str):
+        """Fix the units conversion for the new selection, then redraw."""
+        if units == "Auto":
+            self._unit_factor, self._unit_label = None, "mV"  # Factor detected from data
+        elif units in ("µV", "mV", "V"):
+            self._unit_factor, self._unit_label = 1.0, units
+        else:
+            self._unit_factor, self._unit_label = 1.0, "units"
+        self._update_plots()
+
     def _reset_peaks(self):
         """Reset all removed peaks."""
         self.peaks_removed.clear()
@@ -1127,7 +1795,7 @@ class PeakApp(QMainWindow):
             self.plot_spec.show()
         else:
             self.plot_spec.hide()
-        self._update_plots()
+        self._refresh_frequency_plots()
 
     # ------------------------------------------------------------------
     # Main plot refresh
@@ -1153,17 +1821,19 @@ class PeakApp(QMainWindow):
                 return
                 
             # Apply complete signal processing pipeline
-            v_processed = self._process_signal(v_original)
+            v_processed = self._processed_signal(v_original)
             
             # Detect peaks on processed signal
             peaks, properties = self._detect_peaks(v_processed, prom, dist_ms)
             
             # Apply peak removal
-            keep = np.ones_like(peaks, dtype=bool)
-            for idx in self.peaks_removed:
-                if idx < len(keep):
-                    keep[idx] = False
-            self.curated_peaks = peaks[keep]
+            keep = np.ones(len(peaks), dtype=bool)
+            removed = np.fromiter(self.peaks_removed, dtype=np.int64, count=len(self.peaks_removed))
+            keep[removed[removed < len(keep)]] = False
+            curated = peaks[keep]
+            if self.curated_peaks is None or not np.array_equal(curated, self.curated_peaks):
+                self.curated_peaks = curated
+                self._peaks_version += 1
 
             # Update plots
             self._update_trace_plot(t, v_processed, peaks, keep)
@@ -1179,6 +1849,31 @@ class PeakApp(QMainWindow):
             self.plot_trace.clear()
             self.plot_power.clear()
     
+    def _refresh_frequency_plots(self):
+        """Redraw band power (and spectrogram if shown) without re-detecting peaks.
+        
+        Band limits and spectrogram visibility do not affect peaks, so this
+        reuses the cached processed trace and the cached spectrogram.
+        """
+        if self.fs is None:
+            return
+        
+        t, v_original = self._get_current_trace()
+        if len(t) == 0 or len(v_original) == 0:
+            return
+        
+        v_processed = self._processed_signal(v_original)
+        self._update_frequency_plots(t, v_processed, self.sb_lowF.value(), self.sb_hiF.value())
+    
+    def _peaks_state(self) -> tuple:
+        """Cheap snapshot of everything the peaks table is derived from."""
+        return (
+            self.current_file_path,  # Trace keys repeat across files
+            self._proc_cache_key,
+            self.cb_units.currentText(),
+            self._peaks_version,
+        )
+    
     def _maybe_refresh_table(self):
         """Refresh table dialog if it's open and auto-refresh is enabled."""
         if (self._table_dialog is not None and 
@@ -1191,49 +1886,55 @@ class PeakApp(QMainWindow):
         """Update the main trace plot."""
         self.plot_trace.clear()
         self.plot_trace.addItem(self.scatter)
+        self.plot_trace.addItem(self.scatter_removed)
         
         # Plot processed trace
-        self.plot_trace.plot(t, v_processed, pen=pg.mkPen("#268bd2", width=1))
+        self.plot_trace.plot(t, v_processed, pen=self._trace_pen)
+        
+        # Plot peaks with different colors for kept/removed. Positions go in as
+        # arrays with one shared brush/pen; spot data is the index into peaks.
+        kept_idx = np.flatnonzero(keep)
+        kept_peaks = peaks[kept_idx]
+        self.scatter.setData(x=t[kept_peaks], y=v_processed[kept_peaks], data=kept_idx,
+                             brush=self._peak_brush, 
+                             size=8, 
+                             pen=self._peak_pen)
+        
+        # Removed peaks go in a separate scatter (kept across redraws)
+        removed_idx = np.flatnonzero(~keep)
+        removed_peaks = peaks[removed_idx]
+        self.scatter_removed.setData(x=t[removed_peaks], y=v_processed[removed_peaks], data=removed_idx,
+                                     brush=self._removed_brush,
+                                     size=6,
+                                     pen=self._removed_pen)
+        
+        # Update y-axis label to show active filters (the processing key was
+        # just computed for this refresh; relayout the axis only on change)
+        filter_desc = self._get_filter_description(self._proc_cache_key)
+        label = f"{self._unit_label} ({filter_desc})"
+        if label != self._trace_label:
+            self.plot_trace.setLabel("left", label)
+            self._trace_label = label
+
+    def _get_filter_description(self, proc_key: Optional[tuple] = None) -> str:
+        """Generate description of active filters for plot labels.
+        
+        Memoized on the processing key (pass one already computed to skip
+        re-reading the filter widgets) and the peak polarity.
+        """
+        key = (proc_key if proc_key is not None else self._processing_key(),
+               self.cb_polarity.currentText())
+        if key == self._filter_desc_key:
+            return self._filter_desc
         
-        # Plot peaks with different colors for kept/removed
-        if len(peaks) > 0:
-            kept_spots = []
-            removed_spots = []
-            
-            for i, p in enumerate(peaks):
-                spot_data = {"pos": (t[p], v_processed[p]), "data": i}
-                if keep[i]:
-                    kept_spots.append(spot_data)
-                else:
-                    removed_spots.append(spot_data)
-            
-            # Set scatter data for kept peaks
-            self.scatter.setData(kept_spots, 
-                               brush=pg.mkBrush(255, 0, 0, 180), 
-                               size=8, 
-                               pen=pg.mkPen(255, 255, 255, 200))
-            
-            # Add removed peaks as separate scatter
-            if removed_spots:
-                removed_scatter = pg.ScatterPlotItem()
-                removed_scatter.setData(removed_spots,
-                                      brush=pg.mkBrush(128, 128, 128, 100),
-                                      size=6,
-                                      pen=pg.mkPen(128, 128, 128, 150))
-                self.plot_trace.addItem(removed_scatter)
-        
-        # Update y-axis label to show active filters
-        _, units_label = self._convert_units(np.array([0]))
-        filter_desc = self._get_filter_description()
-        self.plot_trace.setLabel("left", f"{units_label} ({filter_desc})")
-
-    def _get_filter_description(self) -> str:
-        """Generate description of active filters for plot labels."""
         filters = []
         
-        # High-pass filter (always active)
+        # High-pass filter (mean removal only when off)
         cutoff = self.sb_cut.value()
-        filters.append(f"HP {cutoff}Hz")
+        if cutoff > 0:
+            filters.append(f"HP {cutoff}Hz" + (" (fast)" if self.chk_fast_hp.isChecked() else ""))
+        else:
+            filters.append("HP off")
         
         # Notch filter
         if self.chk_notch.isChecked():
@@ -1250,7 +1951,9 @@ class PeakApp(QMainWindow):
         if polarity != "Positive":
             filters.append(f"{polarity} peaks")
         
-        return ", ".join(filters)
+        self._filter_desc = ", ".join(filters)
+        self._filter_desc_key = key
+        return self._filter_desc
 
     def _update_frequency_plots(self, t: np.ndarray, v_hp: np.ndarray, 
                                lowF: float, hiF: float):
@@ -1262,27 +1965,27 @@ class PeakApp(QMainWindow):
             if len(f) == 0 or len(tt) == 0:
                 return
             
+            # Map segment times onto the trace time base (affine)
+            t_interp = t[0] + tt * ((t[-1] - t[0]) / (len(v_hp) / self.fs))
+            
             # Update band power plot
             band_power = self._compute_band_power(f, tt, Sxx, lowF, hiF)
             if len(band_power) > 0 and len(tt) > 1:
-                # Interpolate to match time base
-                t_interp = np.interp(tt, [0, len(v_hp) / self.fs], [t[0], t[-1]])
                 self.plot_power.clear()
                 self.plot_power.plot(t_interp, band_power, 
-                                   pen=pg.mkPen("#d33682", width=2))
+                                   pen=self._power_pen)
             
             # Update spectrogram if visible
             if self.chk_spec.isChecked() and len(Sxx) > 0 and len(tt) > 1:
-                # Time interpolation for spectrogram
-                t_spec = np.interp(tt, [0, len(v_hp) / self.fs], [t[0], t[-1]])
-                
-                # Set image data
-                self._spec_img.setImage(10 * np.log10(Sxx + 1e-10))  # dB scale
+                # Set image data (dB scale, time along x) with explicit levels
+                # so pyqtgraph does not rescan the image for min/max
+                Sxx_db, levels = self._spectrogram_db(Sxx)
+                self._spec_img.setImage(Sxx_db.T, autoLevels=False, levels=levels)
                 
                 # Set proper scaling and positioning
                 self._spec_img.setRect(pg.QtCore.QRectF(
-                    t_spec[0], f[0], 
-                    t_spec[-1] - t_spec[0], f[-1] - f[0]
+                    t_interp[0], f[0], 
+                    t_interp[-1] - t_interp[0], f[-1] - f[0]
                 ))
                 
         except Exception as e:
@@ -1311,29 +2014,14 @@ class PeakApp(QMainWindow):
                 return
             
             # Get processed signal (what's displayed)
-            v_processed = self._process_signal(v_original)
+            v_processed = self._processed_signal(v_original)
             
             # Calculate statistics
-            orig_stats = {
-                'Min': np.min(v_original),
-                'Max': np.max(v_original), 
-                'Mean': np.mean(v_original),
-                'Std': np.std(v_original),
-                'Range': np.ptp(v_original),
-                'RMS': np.sqrt(np.mean(v_original**2))
-            }
-            
-            proc_stats = {
-                'Min': np.min(v_processed),
-                'Max': np.max(v_processed),
-                'Mean': np.mean(v_processed), 
-                'Std': np.std(v_processed),
-                'Range': np.ptp(v_processed),
-                'RMS': np.sqrt(np.mean(v_processed**2))
-            }
+            orig_stats = _trace_stats(v_original)
+            proc_stats = _trace_stats(v_processed)
             
             # Units suggestions
-            max_orig = np.max(np.abs(v_original))
+            max_orig = max(orig_stats['Max'], -orig_stats['Min'])
             if max_orig > 1000:
                 units_suggestion = "µV (convert to mV by dividing by 1000)"
             elif max_orig > 10:
@@ -1344,38 +2032,38 @@ class PeakApp(QMainWindow):
                 units_suggestion = "V (convert to mV by multiplying by 1000)"
             
             # Build info text
-            info_text = f"Signal Analysis\n"
-            info_text += f"{'='*50}\n\n"
-            info_text += f"File: {self.current_file_path.name if self.current_file_path else 'Unknown'}\n"
-            info_text += f"Mode: {self.mode.upper()}\n"
+            parts = [f"Signal Analysis\n"]
+            parts.append(f"{'='*50}\n\n")
+            parts.append(f"File: {self.current_file_path.name if self.current_file_path else 'Unknown'}\n")
+            parts.append(f"Mode: {self.mode.upper()}\n")
             if self.mode == "abf":
-                info_text += f"Channel: {self.sb_chan.value()}, Sweep: {self.sb_sweep.value()}\n"
-            info_text += f"Sampling Rate: {self.fs:.1f} Hz\n"
-            info_text += f"Duration: {len(v_original)/self.fs:.2f} s\n\n"
+                parts.append(f"Channel: {self.sb_chan.value()}, Sweep: {self.sb_sweep.value()}\n")
+            parts.append(f"Sampling Rate: {self.fs:.1f} Hz\n")
+            parts.append(f"Duration: {len(v_original)/self.fs:.2f} s\n\n")
             
-            info_text += f"ORIGINAL SIGNAL STATISTICS:\n"
-            info_text += f"{'─'*30}\n"
+            parts.append(f"ORIGINAL SIGNAL STATISTICS:\n")
+            parts.append(f"{'─'*30}\n")
             for key, value in orig_stats.items():
-                info_text += f"{key:>8}: {value:>12.6f}\n"
+                parts.append(f"{key:>8}: {value:>12.6f}\n")
             
             filter_desc = self._get_filter_description()
-            info_text += f"\nPROCESSED SIGNAL STATISTICS ({filter_desc}):\n"
-            info_text += f"{'─'*30}\n"
+            parts.append(f"\nPROCESSED SIGNAL STATISTICS ({filter_desc}):\n")
+            parts.append(f"{'─'*30}\n")
             for key, value in proc_stats.items():
-                info_text += f"{key:>8}: {value:>12.6f}\n"
+                parts.append(f"{key:>8}: {value:>12.6f}\n")
             
-            info_text += f"\nUNITS RECOMMENDATION:\n"
-            info_text += f"{'─'*30}\n"
-            info_text += f"Based on signal range: {units_suggestion}\n"
-            info_text += f"Current units setting: {self.cb_units.currentText()}\n\n"
+            parts.append(f"\nUNITS RECOMMENDATION:\n")
+            parts.append(f"{'─'*30}\n")
+            parts.append(f"Based on signal range: {units_suggestion}\n")
+            parts.append(f"Current units setting: {self.cb_units.currentText()}\n\n")
             
             # Peak filtering info
-            info_text += f"PEAK DETECTION SETTINGS:\n"
-            info_text += f"{'─'*30}\n"
-            info_text += f"Peak type: {self.cb_polarity.currentText()}\n"
-            info_text += f"Prominence: {self.sb_prom.value()}\n"
-            info_text += f"Min distance: {self.sb_dist.value()} ms\n"
-            info_text += f"Width range: {self.sb_min_width.value()}-{self.sb_max_width.value()} ms\n\n"
+            parts.append(f"PEAK DETECTION SETTINGS:\n")
+            parts.append(f"{'─'*30}\n")
+            parts.append(f"Peak type: {self.cb_polarity.currentText()}\n")
+            parts.append(f"Prominence: {self.sb_prom.value()}\n")
+            parts.append(f"Min distance: {self.sb_dist.value()} ms\n")
+            parts.append(f"Width range: {self.sb_min_width.value()}-{self.sb_max_width.value()} ms\n\n")
             
             if self.curated_peaks is not None and len(self.curated_peaks) > 0:
                 # Peak amplitude analysis - now from processed signal
@@ -1383,17 +2071,19 @@ class PeakApp(QMainWindow):
                 peak_amps_converted, units_label = self._convert_units(peak_amps_corrected)
                 peak_widths = self._calculate_peak_widths(v_processed, self.curated_peaks)
                 
-                info_text += f"PEAK MEASUREMENTS ({len(self.curated_peaks)} peaks):\n"
-                info_text += f"{'─'*30}\n"
-                info_text += f"Measured from: PROCESSED signal (displayed)\n"
-                info_text += f"Min amplitude: {np.min(peak_amps_converted):.4f} {units_label}\n"
-                info_text += f"Max amplitude: {np.max(peak_amps_converted):.4f} {units_label}\n"
-                info_text += f"Mean amplitude: {np.mean(peak_amps_converted):.4f} {units_label}\n"
-                info_text += f"Std amplitude: {np.std(peak_amps_converted):.4f} {units_label}\n"
-                info_text += f"Min width: {np.min(peak_widths)*1000:.2f} ms\n"
-                info_text += f"Max width: {np.max(peak_widths)*1000:.2f} ms\n"
-                info_text += f"Mean width: {np.mean(peak_widths)*1000:.2f} ms\n"
-                info_text += f"Std width: {np.std(peak_widths)*1000:.2f} ms\n"
+                parts.append(f"PEAK MEASUREMENTS ({len(self.curated_peaks)} peaks):\n")
+                parts.append(f"{'─'*30}\n")
+                parts.append(f"Measured from: PROCESSED signal (displayed)\n")
+                parts.append(f"Min amplitude: {np.min(peak_amps_converted):.4f} {units_label}\n")
+                parts.append(f"Max amplitude: {np.max(peak_amps_converted):.4f} {units_label}\n")
+                parts.append(f"Mean amplitude: {np.mean(peak_amps_converted):.4f} {units_label}\n")
+                parts.append(f"Std amplitude: {np.std(peak_amps_converted):.4f} {units_label}\n")
+                parts.append(f"Min width: {np.min(peak_widths)*1000:.2f} ms\n")
+                parts.append(f"Max width: {np.max(peak_widths)*1000:.2f} ms\n")
+                parts.append(f"Mean width: {np.mean(peak_widths)*1000:.2f} ms\n")
+                parts.append(f"Std width: {np.std(peak_widths)*1000:.2f} ms\n")
+            
+            info_text = "".join(parts)
             
             # Show in dialog
             msg = QMessageBox(self)
@@ -1427,7 +2117,7 @@ class PeakApp(QMainWindow):
             # Bring existing dialog to front and refresh
             self._table_dialog.raise_()
             self._table_dialog.activateWindow()
-            self._table_dialog.refresh_data()
+            self._table_dialog.refresh_data(force=True)
     
     def _show_timeline(self):
         """Show peaks timeline plot."""
@@ -1442,11 +2132,7 @@ class PeakApp(QMainWindow):
         timing_method = peaks_data['Timing_Method'][0]
         
         # Show timeline plot
-        self.plot_peaks.show()
-        spots = [{"pos": (t, 0.5)} for t in peak_times]
-        self._peak_timeline.setData(spots)
-        self.plot_peaks.setYRange(0, 1)
-        self.plot_peaks.getAxis('left').setTicks([[(0.5, 'Peaks')]])
+        self._show_peaks_timeline(peak_times)
         
         # Update timeline title to show timing method
         self.plot_peaks.setTitle(f"Peaks Timeline (Timing: {timing_method})")
@@ -1456,6 +2142,17 @@ class PeakApp(QMainWindow):
             f"Timeline shown with {len(peak_times)} peaks using {timing_method} timing."
         )
     
+    def _export_path(self, default_name: str) -> str:
+        """Default save path: the file name inside the last export directory."""
+        if self._last_export_dir:
+            return str(Path(self._last_export_dir) / default_name)
+        return default_name
+    
+    def _remember_export_dir(self, fname: str):
+        """Store the directory of a successful export for the next save dialog."""
+        self._last_export_dir = str(Path(fname).parent)
+        self._settings.setValue("last_export_dir", self._last_export_dir)
+    
     def _export_csv(self):
         """Export detected peaks to CSV."""
         peaks_data = self._get_current_peaks_data()
@@ -1472,26 +2169,22 @@ class PeakApp(QMainWindow):
                 default_name = "peaks.csv"
                 
             fname, _ = QFileDialog.getSaveFileName(
-                self, "Export Peaks CSV", default_name, "CSV files (*.csv)"
+                self, "Export Peaks CSV", self._export_path(default_name), "CSV files (*.csv)"
             )
             
             if not fname:
                 return
 
-            # Convert to DataFrame
-            df = pd.DataFrame(peaks_data)
-            
             # Generate metadata
             metadata = self._generate_export_metadata(peaks_data)
             
             # Write file with metadata
-            with open(fname, 'w') as f:
-                f.write('\n'.join(metadata))
-                df.to_csv(f, index=False)
+            _write_csv_with_header(fname, metadata, peaks_data)
+            self._remember_export_dir(fname)
             
             QMessageBox.information(
                 self, "Export Complete", 
-                f"Exported {len(df)} peaks to:\n{fname}"
+                f"Exported {len(peaks_data['Peak_Index'])} peaks to:\n{fname}"
             )
             
         except Exception as e:
@@ -1499,212 +2192,64 @@ class PeakApp(QMainWindow):
     
     def _generate_export_metadata(self, peaks_data: dict) -> list:
         """Generate metadata comments for export file."""
-        n_peaks = len(list(peaks_data.values())[0]) if peaks_data else 0
-        timing_method = peaks_data.get('Timing_Method', ['unknown'])[0] if peaks_data else 'unknown'
-        
-        # Get current units and filter description
-        _, units_label = self._convert_units(np.array([0]))
-        filter_desc = self._get_filter_description()
-        
-        metadata = [
-            f"# Peak Detection Results",
-            f"# Generated by: Low-Mg²⁺ Peak Curator v1.4.1",
-            f"# Export time: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            f"# Source file: {self.current_file_path.name if self.current_file_path else 'Unknown'}",
-            f"#",
-            f"# Signal Processing Pipeline:",
-            f"# - High-pass filter: {self.sb_cut.value()} Hz",
-        ]
-        
-        if self.chk_notch.isChecked():
-            metadata.append(f"# - Notch filter: {self.sb_notch_freq.value()} Hz (Q={self.sb_notch_q.value()})")
-        
-        if self.chk_smooth.isChecked():
-            metadata.append(f"# - Smoothing: Savitzky-Golay window={self.sb_smooth_window.value()}")
-        
-        metadata.extend([
-            f"#",
-            f"# Peak Detection Parameters:",
-            f"# - Peak polarity: {self.cb_polarity.currentText()}",
-            f"# - Prominence threshold: {self.sb_prom.value()} {units_label}",
-            f"# - Minimum distance: {self.sb_dist.value()} ms",
-            f"# - Width range: {self.sb_min_width.value()}-{self.sb_max_width.value()} ms",
-            f"# - Sampling rate: {self.fs} Hz",
-            f"# - Amplitude units: {units_label} (from processed signal)",
-            f"# - Units conversion: {self.cb_units.currentText()}",
-            f"#",
-            f"# Results:",
-            f"# - Total peaks exported: {n_peaks}",
-            f"# - Peaks removed by user: {len(self.peaks_removed)}",
-            f"# - Timing method: {timing_method}",
-            f"#",
-            f"# Measurement Details:",
-            f"# - Processing: {filter_desc}",
-            f"# - Amplitudes: Baseline-corrected from processed signal",
-            f"# - Width: FWHM (Full Width at Half Maximum) with local baseline",
-            f"# - Only peaks within width range [{self.sb_min_width.value()}-{self.sb_max_width.value()}ms] are included",
-        ])
+        n_peaks = len(next(iter(peaks_data.values()))) if peaks_data else 0
+        timing_method = peaks_data.get('Timing_Method', _DEFAULT_TIMING)[0] if peaks_data else 'unknown'
         
-        if self.mode == "abf":
-            metadata.extend([
-                f"#",
-                f"# ABF File Details:",
-                f"# - Current sweep: {self.sb_sweep.value()}",
-                f"# - Current channel: {self.sb_chan.value()}",
-                f"# - Total sweeps: {self.abf.sweepCount if self.abf else 'Unknown'}",
-                f"# - Total channels: {self.abf.channelCount if self.abf else 'Unknown'}",
-                f"#",
-                f"# Timing Explanation:",
-                f"# - Time_Relative_s: Time within current sweep",
-                f"# - Time_Absolute_s: Absolute time from experiment start",
-                f"#   Example: Peak at 7s in sweep 4 with 30s sweeps = (30×3)+7 = 97s",
-            ])
+        # Units label is fixed when the units selection changes
+        units_label = self._unit_label
         
-        metadata.append("")  # Empty line before data
-        return metadata
-        """Export detected peaks to CSV with comprehensive timing information."""
-        if self.curated_peaks is None or len(self.curated_peaks) == 0:
-            QMessageBox.warning(self, "No peaks", "No peaks detected to export!")
-            return
-
-        try:
-            # Get current data
-            t, v_hp = self._get_current_trace()
-            peak_times = t[self.curated_peaks]
-            peak_amplitudes = v_hp[self.curated_peaks]
-
-            # Ask for save location
-            if self.current_file_path:
-                default_name = self.current_file_path.stem + "_peaks.csv"
-            else:
-                default_name = "peaks.csv"
-                
-            fname, _ = QFileDialog.getSaveFileName(
-                self, "Export Peaks", default_name, "CSV files (*.csv)"
-            )
-            
-            if not fname:
-                return
-
-            # Create base export data
-            export_data = {
-                'peak_index': self.curated_peaks,
-                'time_relative_s': peak_times,
-                'amplitude_mV': peak_amplitudes,
-            }
-            
-            # Add comprehensive timing for ABF files
-            if self.mode == "abf" and self.abf is not None:
-                current_sweep = self.sb_sweep.value()
-                current_channel = self.sb_chan.value()
-                
-                # Add sweep/channel info
-                export_data['sweep_number'] = np.full_like(self.curated_peaks, current_sweep)
-                export_data['channel_number'] = np.full_like(self.curated_peaks, current_channel)
-                
-                # Calculate absolute timing using multiple methods
-                absolute_times = self._calculate_absolute_timing(peak_times, current_sweep)
-                export_data.update(absolute_times)
-                
-            # Convert to DataFrame
-            df = pd.DataFrame(export_data)
-            
-            # Add metadata as comments
-            metadata = self._generate_export_metadata()
-            
-            # Write file with metadata
-            with open(fname, 'w') as f:
-                f.write('\n'.join(metadata))
-                df.to_csv(f, index=False)
-
-            # Show peaks timeline
-            self._show_peaks_timeline(peak_times)
-            
-            QMessageBox.information(
-                self, "Export Complete", 
-                f"Exported {len(self.curated_peaks)} peaks to:\n{fname}"
-            )
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Export Error", f"Failed to export peaks:\n{str(e)}")
-
-    def _calculate_absolute_timing(self, peak_times: np.ndarray, current_sweep: int) -> dict:
-        """Calculate absolute timing for ABF peaks using multiple methods."""
-        timing_data = {}
-        
-        if self.abf is None:
-            return timing_data
-        
-        try:
-            # Method 1: Using sweepTimesSec if available
-            if hasattr(self.abf, 'sweepTimesSec') and len(self.abf.sweepTimesSec) > current_sweep:
-                sweep_start = self.abf.sweepTimesSec[current_sweep]
-                timing_data['time_absolute_method1_s'] = sweep_start + peak_times
-        except (IndexError, TypeError, AttributeError):
-            pass
-        
-        try:
-            # Method 2: Using sweepLengthSec if available  
-            if hasattr(self.abf, 'sweepLengthSec'):
-                sweep_start = current_sweep * self.abf.sweepLengthSec
-                timing_data['time_absolute_method2_s'] = sweep_start + peak_times
-        except (AttributeError, TypeError):
-            pass
-        
-        try:
-            # Method 3: Manual calculation from data points
-            sweep_start = current_sweep * len(self.abf.sweepX) / self.abf.dataRate
-            timing_data['time_absolute_method3_s'] = sweep_start + peak_times
-        except (AttributeError, TypeError, ZeroDivisionError):
-            pass
-        
-        # Add sampling info for reference
-        timing_data['sampling_rate_hz'] = np.full_like(peak_times, self.fs)
+        # Read each widget once into the template context
+        cutoff = self.sb_cut.value()
+        if cutoff > 0:
+            highpass = f"# - High-pass filter: {cutoff} Hz"
+            if self.chk_fast_hp.isChecked():
+                highpass += " (single pass, not zero-phase)"
+        else:
+            highpass = "# - High-pass filter: off (mean removed)"
+        ctx = {
+            'export_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'source': self.current_file_path.name if self.current_file_path else 'Unknown',
+            'highpass': highpass,
+            'notch_freq': self.sb_notch_freq.value(),
+            'notch_q': self.sb_notch_q.value(),
+            'smooth_window': self.sb_smooth_window.value(),
+            'polarity': self.cb_polarity.currentText(),
+            'prominence': self.sb_prom.value(),
+            'units_label': units_label,
+            'distance': self.sb_dist.value(),
+            'min_width': self.sb_min_width.value(),
+            'max_width': self.sb_max_width.value(),
+            'fs': self.fs,
+            'units_setting': self.cb_units.currentText(),
+            'n_peaks': n_peaks,
+            'n_removed': len(self.peaks_removed),
+            'timing_method': timing_method,
+            'filter_desc': self._get_filter_description(),
+        }
         
-        return timing_data
-
-    def _generate_export_metadata(self) -> list:
-        """Generate metadata comments for export file."""
-        metadata = [
-            f"# Peak detection results",
-            f"# Generated by: Low-Mg²⁺ Peak Curator v1.4.1",
-            f"# Export time: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            f"# Source file: {self.current_file_path.name if self.current_file_path else 'Unknown'}",
-            f"#",
-            f"# Detection parameters:",
-            f"# - High-pass cutoff: {self.sb_cut.value()} Hz",
-            f"# - Prominence threshold: {self.sb_prom.value()} mV", 
-            f"# - Minimum distance: {self.sb_dist.value()} ms",
-            f"# - Sampling rate: {self.fs} Hz",
-            f"#",
-            f"# Results:",
-            f"# - Total peaks found: {len(self.curated_peaks)}",
-            f"# - Peaks removed: {len(self.peaks_removed)}",
-        ]
+        templates = list(self._METADATA_HEAD_TMPL)
+        if self.chk_notch.isChecked():
+            templates.append(self._METADATA_NOTCH_TMPL)
+        if self.chk_smooth.isChecked():
+            templates.append(self._METADATA_SMOOTH_TMPL)
+        templates.extend(self._METADATA_BODY_TMPL)
         
         if self.mode == "abf":
-            metadata.extend([
-                f"#",
-                f"# ABF file details:",
-                f"# - Current sweep: {self.sb_sweep.value()}",
-                f"# - Current channel: {self.sb_chan.value()}",
-                f"# - Total sweeps: {self.abf.sweepCount if self.abf else 'Unknown'}",
-                f"# - Total channels: {self.abf.channelCount if self.abf else 'Unknown'}",
-                f"#",
-                f"# Timing columns explanation:",
-                f"# - time_relative_s: Time within current sweep (for display consistency)",
-                f"# - time_absolute_method*_s: Different methods to calculate absolute experiment time",
-                f"# - Use the absolute timing method that makes sense for your experiment",
-            ])
+            ctx['sweep'] = self.sb_sweep.value()
+            ctx['channel'] = self.sb_chan.value()
+            ctx['sweep_count'] = self.abf.sweepCount if self.abf else 'Unknown'
+            ctx['channel_count'] = self.abf.channelCount if self.abf else 'Unknown'
+            templates.extend(self._METADATA_ABF_TMPL)
         
+        metadata = [line.format_map(ctx) for line in templates]
         metadata.append("")  # Empty line before data
         return metadata
 
     def _show_peaks_timeline(self, peak_times: np.ndarray):
         """Show the peaks timeline plot."""
         self.plot_peaks.show()
-        spots = [{"pos": (t, 0.5)} for t in peak_times]
-        self._peak_timeline.setData(spots)
+        peak_times = np.asarray(peak_times, dtype=np.float64)
+        self._peak_timeline.setData(x=peak_times, y=np.full(len(peak_times), 0.5))
         self.plot_peaks.setYRange(0, 1)
         self.plot_peaks.getAxis('left').setTicks([[(0.5, 'Peaks')]])
 
@@ -1718,76 +2263,72 @@ class PeakApp(QMainWindow):
             QMessageBox.information(self, "No File", "No file currently loaded.")
             return
             
-        info_text = f"File: {self.current_file_path.name}\n"
-        info_text += f"Path: {self.current_file_path}\n"
-        info_text += f"Mode: {self.mode.upper()}\n"
-        info_text += f"Sampling Rate: {self.fs:.1f} Hz\n\n"
+        parts = [f"File: {self.current_file_path.name}\n"]
+        parts.append(f"Path: {self.current_file_path}\n")
+        parts.append(f"Mode: {self.mode.upper()}\n")
+        parts.append(f"Sampling Rate: {self.fs:.1f} Hz\n\n")
         
         if self.mode == "abf" and self.abf is not None:
-            info_text += "=== ABF File Details ===\n"
+            parts.append("=== ABF File Details ===\n")
             
-            # Basic properties
-            attrs_to_show = [
-                ('Protocol', 'protocol'),
-                ('Channels', 'channelCount'), 
-                ('Sweeps', 'sweepCount'),
-                ('Data Points per Sweep', 'dataPointsPerSweep'),
-                ('Recording Duration (s)', 'recordingLengthSec'),
-                ('Sweep Length (s)', 'sweepLengthSec'),
-                ('Data Rate (Hz)', 'dataRate'),
-            ]
+            # Basic properties, fetched in one call (older pyabf may lack some)
+            try:
+                values = _ABF_ATTR_GETTER(self.abf)
+            except AttributeError:
+                values = tuple(getattr(self.abf, attr, _MISSING) for attr in _ABF_INFO_ATTRS)
             
-            for label, attr in attrs_to_show:
-                if hasattr(self.abf, attr):
-                    value = getattr(self.abf, attr)
-                    info_text += f"{label}: {value}\n"
+            for label, value in zip(_ABF_INFO_LABELS, values):
+                if value is not _MISSING:
+                    parts.append(f"{label}: {value}\n")
             
             # Timing information
-            info_text += "\n=== Timing Information ===\n"
-            timing_attrs = ['sweepTimesSec', 'sweepTimesMin', 'sweepStartSec']
+            parts.append("\n=== Timing Information ===\n")
             
-            for attr in timing_attrs:
-                if hasattr(self.abf, attr):
-                    value = getattr(self.abf, attr)
+            for attr in _ABF_TIMING_ATTRS:
+                value = getattr(self.abf, attr, _MISSING)
+                if value is not _MISSING:
                     if hasattr(value, '__len__') and not isinstance(value, str):
                         if len(value) > 0:
-                            info_text += f"{attr}: [{value[0]:.3f}, {value[1]:.3f}, ...] (length={len(value)})\n"
+                            head = ", ".join(f"{x:.3f}" for x in value[:2])
+                            parts.append(f"{attr}: [{head}, ...] (length={len(value)})\n")
                         else:
-                            info_text += f"{attr}: empty array\n"
+                            parts.append(f"{attr}: empty array\n")
                     else:
-                        info_text += f"{attr}: {value}\n"
+                        parts.append(f"{attr}: {value}\n")
                 else:
-                    info_text += f"{attr}: Not available\n"
+                    parts.append(f"{attr}: Not available\n")
             
             # Channel information
-            info_text += "\n=== Channel Information ===\n"
+            parts.append("\n=== Channel Information ===\n")
+            channel_list = getattr(self.abf, 'channelList', _MISSING)
             for i in range(self.abf.channelCount):
-                if hasattr(self.abf, 'channelList'):
-                    info_text += f"Channel {i}: {self.abf.channelList[i]}\n"
+                if channel_list is not _MISSING:
+                    parts.append(f"Channel {i}: {channel_list[i]}\n")
                 else:
-                    info_text += f"Channel {i}: Available\n"
+                    parts.append(f"Channel {i}: Available\n")
                     
         elif self.mode == "csv":
-            info_text += "=== CSV File Details ===\n"
-            info_text += f"Available traces: {len(self.traces)}\n"
+            parts.append("=== CSV File Details ===\n")
+            parts.append(f"Available traces: {len(self.traces)}\n")
             for i, (t, v) in enumerate(self.traces):
-                info_text += f"  Trace {i+1}: {len(t)} points, duration {t[-1]-t[0]:.2f}s\n"
+                parts.append(f"  Trace {i+1}: {len(t)} points, duration {t[-1]-t[0]:.2f}s\n")
         
         # Current analysis state
         if self.curated_peaks is not None:
-            info_text += f"\n=== Current Analysis ===\n"
-            info_text += f"Detected peaks: {len(self.curated_peaks)}\n"
-            info_text += f"Removed peaks: {len(self.peaks_removed)}\n"
-            info_text += f"HP filter: {self.sb_cut.value()} Hz\n"
-            info_text += f"Prominence: {self.sb_prom.value()} mV\n"
-            info_text += f"Min distance: {self.sb_dist.value()} ms\n"
-        
-        # Show in message box with monospace font for better formatting
-        msg = QMessageBox(self)
-        msg.setWindowTitle("File Information")
-        msg.setText(info_text)
-        msg.setFont(msg.font())  # Use monospace if available
-        msg.exec_()
+            parts.append(f"\n=== Current Analysis ===\n")
+            parts.append(f"Detected peaks: {len(self.curated_peaks)}\n")
+            parts.append(f"Removed peaks: {len(self.peaks_removed)}\n")
+            parts.append(f"HP filter: {self.sb_cut.value()} Hz\n")
+            parts.append(f"Prominence: {self.sb_prom.value()} mV\n")
+            parts.append(f"Min distance: {self.sb_dist.value()} ms\n")
+        
+        self._show_text_dialog("File Information", "".join(parts))
+
+    def _show_text_dialog(self, title: str, text: str):
+        """Show read-only text in a dialog that is built once and reused."""
+        if self._text_dialog is None:
+            self._text_dialog = TextDialog(self)
+        self._text_dialog.show_text(title, text)
 
 
 def main():